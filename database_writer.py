@@ -6,7 +6,7 @@ Provides dual-write capability to PostgreSQL (Supabase)
 
 import os
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 from datetime import datetime
 from typing import Dict, List, Optional
 from dotenv import load_dotenv
@@ -62,11 +62,12 @@ class DatabaseWriter:
                     title, url, condition, grade, price, price_change, seller,
                     machine, model, year, cpu, cpu_cores, storage, ram, gpu, colour,
                     variant_id, warning, scraped_at, screen
-                ) VALUES (
-                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-                )
+                ) VALUES %s
             """
             
+            # Build every row first, then send them in multi-row INSERTs rather than
+            # one round-trip per product
+            rows = []
             for product in products:
                 try:
                     # Parse price (remove currency symbols)
@@ -124,15 +125,17 @@ class DatabaseWriter:
                         product.get('Screen')  # For Studio Display glass type
                     )
                     
-                    cursor.execute(insert_query, values)
-                    inserted += 1
+                    rows.append(values)
                     
                 except Exception as e:
                     print(f"⚠️ Failed to insert product '{product.get('Title', 'Unknown')}': {e}")
                     continue
             
+            execute_values(cursor, insert_query, rows, page_size=500)
+            
             # Commit all inserts
             self.connection.commit()
+            inserted = len(rows)
             print(f"💾 Inserted {inserted} records to database")
             
         except Exception as e:
@@ -28,15 +28,22 @@ Dependencies:
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import re
 import json
+import csv
 import time
 import os
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from urllib.parse import urljoin, urlparse, parse_qs
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from typing import List, Dict, Optional, Set
 import pandas as pd
+import numpy as np
 
 # Database writer for dual-write capability
 try:
@@ -58,6 +65,7 @@ except ImportError:
 # Google Sheets integration
 try:
     import gspread
+    from gspread.utils import a1_range_to_grid_range, absolute_range_name, rowcol_to_a1
     from oauth2client.service_account import ServiceAccountCredentials
     GOOGLE_SHEETS_AVAILABLE = True
 except ImportError:
@@ -75,6 +83,212 @@ CURRENT_SHEET_NAME = "Current Inventory"
 PRICE_HISTORY_SHEET_NAME = "Price History"
 AVAILABILITY_HISTORY_SHEET_NAME = "Availability History"
 
+# Category pages fetched in parallel per category (kept small to stay polite to apple.com)
+CATEGORY_PAGE_WORKERS = 4
+
+# Product pages fetched in parallel for the specs step (same politeness bound)
+PRODUCT_PAGE_WORKERS = 4
+
+# Politeness limit shared by every request (category, probe and product pages alike);
+# halved on each 429/503 and stepped back up on success
+REQUESTS_PER_SECOND = 4
+
+# Standardized rows are written to the database in transactions of this size
+DB_WRITE_BATCH_SIZE = 500
+
+# Local mirror of the Current Inventory rows, read instead of the sheet for change detection
+# while the sheet's last row still matches the marker saved with it (set to None to always
+# read the sheet; run with --resync to refresh it from the sheet once)
+INVENTORY_CACHE_FILE = ".inventory_cache.json"
+
+# values.get parameters for reading Current Inventory: plain numbers for the currency columns,
+# dates as their formatted strings
+INVENTORY_READ_PARAMS = {
+    'majorDimension': 'ROWS',
+    'valueRenderOption': 'UNFORMATTED_VALUE',
+    'dateTimeRenderOption': 'FORMATTED_STRING'
+}
+
+# print_summary switches from a Python loop to pandas column operations above this many products
+SUMMARY_FRAME_THRESHOLD = 200
+SUMMARY_SPEC_FIELDS = ('memory', 'storage', 'chip', 'color')
+SUMMARY_SPEC_LABELS = tuple(field.title() for field in SUMMARY_SPEC_FIELDS)
+
+# print_summary report templates, filled with str.format_map
+SUMMARY_TEMPLATE = (
+    "\n🎉 SCRAPING COMPLETE!\n"
+    + "=" * 60 + "\n"
+    "📊 Total products found: {product_count}\n"
+    "💰 Products with pricing: {priced_count}/{product_count} ({priced_percent:.1f}%)\n"
+    "💰 Total catalog value: £{total_value:,.2f}\n"
+    "💸 Total potential savings: £{total_savings:,.2f}\n"
+    "📈 Average discount: {avg_discount:.1f}%\n"
+    "\n🔧 Specs coverage:"
+)
+SPEC_COVERAGE_TEMPLATE = "   {label}: {count}/{product_count} ({percent:.1f}%)"
+BEST_DEAL_TEMPLATE = (
+    "\n🏆 BEST DEAL:\n"
+    "💰 {name}...\n"
+    "    £{current_price} (save £{savings})"
+)
+HISTORICAL_TRACKING_SUMMARY = (
+    "\n📊 HISTORICAL TRACKING:\n"
+    "   📋 Current Inventory: Updated with latest data\n"
+    "   📈 Price History: Tracking all price changes over time\n"
+    "   📦 Availability History: Tracking products appearing/disappearing\n"
+    "   🎯 Standardized History: Tracking standardized format over time\n"
+    f"   🔗 View data: https://docs.google.com/spreadsheets/d/{GOOGLE_SHEET_ID}"
+)
+
+# Column order for raw product rows (CSV, Current Inventory, History, original sheet)
+PRODUCT_COLUMN_ORDER = [
+    'name', 'chip', 'cpu_cores', 'gpu_cores', 'memory', 'storage',
+    'display_size', 'color', 'current_price', 'original_price', 
+    'savings', 'discount_percentage', 'connectivity', 'url', 
+    'model_sku', 'scraped_at'
+]
+
+# Fields every product gets from extract_detailed_specs (None when not found)
+SPEC_FIELDS = (
+    'memory', 'storage', 'chip', 'display_size',
+    'color', 'connectivity', 'cpu_cores', 'gpu_cores'
+)
+
+# Spec patterns for extract_detailed_specs, in priority order (first match wins)
+STORAGE_PATTERNS = [re.compile(p, re.IGNORECASE) for p in [
+    r'(\d+(?:GB|TB))\s+SSD',
+    r'(\d+(?:GB|TB))\s+storage',
+    r'Storage[:\s]+(\d+(?:GB|TB))',
+    r'(\d+(?:GB|TB))\s+internal storage',
+    r'(\d+(?:GB|TB))\s+of storage',
+    r'with\s+(\d+(?:GB|TB))\s+SSD',
+    r'includes\s+(\d+(?:GB|TB))',
+    r'featuring\s+(\d+(?:GB|TB))',
+    r'(\d+(?:GB|TB))\s*-\s*',
+    r'-\s*(\d+(?:GB|TB))',
+    r'Capacity[:\s]*(\d+(?:GB|TB))',
+    r'Flash Storage[:\s]*(\d+(?:GB|TB))'
+]]
+
+MEMORY_PATTERNS = [re.compile(p, re.IGNORECASE) for p in [
+    r'(\d+GB)\s+unified memory',
+    r'(\d+GB)\s+memory',
+    r'Memory[:\s]+(\d+GB)',
+    r'with\s+(\d+GB)\s+of\s+unified\s+memory',
+    r'(\d+GB)\s+RAM',
+    r'Unified Memory[:\s]*(\d+GB)'
+]]
+
+CHIP_PATTERNS = [re.compile(p, re.IGNORECASE) for p in [
+    r'Apple (M\d+(?:\s+Pro|\s+Max|\s+Ultra)?)',
+    r'(M\d+(?:\s+Pro|\s+Max|\s+Ultra)?)\s+[Cc]hip',
+    r'Apple (M\d+)'
+]]
+
+CPU_CORES_PATTERN = re.compile(r'(\d+)[\-‑]Core CPU', re.IGNORECASE)
+GPU_CORES_PATTERN = re.compile(r'(\d+)[\-‑]Core GPU', re.IGNORECASE)
+
+# Every storage and memory pattern captures one of these; pages without any skip both loops
+SIZE_TOKEN_PATTERN = re.compile(r'\d+(?:GB|TB)', re.IGNORECASE)
+
+# Size/unit parsing of storage and memory candidates
+SPEC_NUMBER_PATTERN = re.compile(r'\d+')
+STORAGE_UNIT_PATTERN = re.compile(r'[GT]B')
+
+# Product-name patterns (short, trusted text - standard re is fine)
+DISPLAY_PATTERNS = [re.compile(p, re.IGNORECASE) for p in [
+    r'(\d+(?:\.\d+)?[\-‑]inch)',
+    r'(\d+(?:\.\d+)?")',
+    r'(\d+(?:\.\d+)?)\s*inch'
+]]
+IPHONE_MODEL_PATTERN = re.compile(r'iPhone\s+(\d+)(?:\s+(Pro|Pro Max|Plus|mini))?', re.IGNORECASE)
+IPAD_MODEL_PATTERN = re.compile(r'iPad\s+(Pro|Air|mini)?(?:\s+(\d+(?:\.\d+)?)-?inch)?', re.IGNORECASE)
+
+# Fixed connectivity vocabulary - scanned once per product page, longest keywords first
+CONNECTIVITY_PATTERN = re.compile(r'Gigabit Ethernet|10Gb Ethernet|Wi-?Fi \+ Cellular|Cellular|Wi-Fi')
+
+# Colour vocabulary in priority order (Sky Blue must come before Blue to match correctly).
+# Each colour gets its own group so the winning pattern is m.lastindex; the lookahead
+# lets overlapping colours (e.g. "Rose Gold" / "Gold") all be seen in a single pass.
+COLOR_NAMES = [
+    'Space (?:Grey|Gray|Black)', 'Silver', 'Gold', 'Rose Gold', 'Midnight', 'Starlight',
+    'Sky Blue', 'Blue', 'Green', 'Pink', 'Purple', 'Yellow', 'Orange', 'Red'
+]
+COLOR_PATTERN = re.compile(r'(?=[\-\s](?:' + '|'.join(f'({c})' for c in COLOR_NAMES) + '))', re.IGNORECASE)
+
+# Product links on category pages
+PRODUCT_HREF_PATTERN = re.compile(r'/uk/shop/product/')
+
+# Manually probed page URLs are only checked for product links, so only those are built
+PRODUCT_LINK_STRAINER = SoupStrainer('a', href=PRODUCT_HREF_PATTERN)
+
+# Product pages are only read for their visible text, so <head> (meta, link and script tags)
+# is never built into the soup
+PRODUCT_PAGE_STRAINER = SoupStrainer('body')
+
+# Price text clean-up and extraction for extract_prices_from_text
+HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+PRICE_PATTERN = re.compile(r'£([\d,]+(?:\.\d{2})?)')
+
+
+def to_price_array(values) -> np.ndarray:
+    """Parse a column of scraped/sheet prices to float64 in one pass (unparseable -> 0)."""
+    return pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+
+
+def diff_prices(current_prices: np.ndarray, previous_prices: np.ndarray) -> np.ndarray:
+    """Return indices where both prices are known and differ."""
+    return np.flatnonzero((current_prices != previous_prices) & (current_prices > 0) & (previous_prices > 0))
+
+
+class TokenBucket:
+    """Thread-safe token bucket: allows short bursts up to capacity, then rate requests per second.
+    
+    The rate adapts (AIMD): throttle() halves it when the server pushes back, and each
+    recover() adds back an eighth of the configured rate until it is restored.
+    """
+
+    def __init__(self, rate: float, capacity: int, min_rate: float = 0.25):
+        self.max_rate = rate
+        self.min_rate = min_rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        """Add the tokens earned since the last update (caller holds the lock)."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def throttle(self):
+        """Halve the rate after a 429/503 and drop any saved-up burst, so every worker slows down."""
+        with self.lock:
+            self._refill()
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+            print(f"🐢 Server pushed back, slowing to {self.rate:.2f} requests/s")
+
+    def recover(self):
+        """Step the rate back up towards the configured rate after a successful request."""
+        with self.lock:
+            if self.rate < self.max_rate:
+                self._refill()
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 8)
+
 
 class AppleDataStandardizer:
     """Embedded standardizer for converting Apple scraper data to dashboard format."""
@@ -1083,10 +1297,32 @@ class AppleMacScraperV7Historical:
             'Sec-Fetch-Site': 'same-origin',
             'Cache-Control': 'max-age=0',
         })
+        # Every request goes to www.apple.com: one pool, sized so each worker keeps its own
+        # keep-alive connection and pays the TLS handshake once
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=1, pool_maxsize=max(CATEGORY_PAGE_WORKERS, PRODUCT_PAGE_WORKERS)))
+        self.rate_limiter = TokenBucket(REQUESTS_PER_SECOND, max(CATEGORY_PAGE_WORKERS, PRODUCT_PAGE_WORKERS))
         
         # Initialize Google Sheets client
         self.google_client = None
         self.spreadsheet = None
+        self.worksheet_cache = {}  # title -> worksheet handle, filled on first use
+        # Queued full-sheet rewrites, sent together by flush_sheet_writes()
+        self.pending_sheet_requests = []
+        self.pending_value_ranges = []
+        self.pending_sheet_titles = []
+        # Current Inventory rows for INVENTORY_CACHE_FILE, saved once the flush that sends them succeeds
+        self.pending_inventory_mirror = None
+        
+        # Optional DatabaseWriter (set by main); standardized rows wait here until a
+        # full DB_WRITE_BATCH_SIZE batch is ready or flush_database_writes() is called
+        self.db_writer = None
+        self.pending_db_rows = deque()
+        self.db_rows_written = 0
+        
+        # Set by main for --resync: read previous data from the sheet even if the mirror exists
+        self.resync_inventory = False
+        
         if GOOGLE_SHEETS_AVAILABLE:
             self.setup_google_sheets()
 
@@ -1117,31 +1353,133 @@ class AppleMacScraperV7Historical:
             print(f"❌ Failed to set up Google Sheets: {e}")
             return False
 
+    def get_worksheet(self, title: str):
+        """Return a worksheet handle, looking it up on the spreadsheet only once per run."""
+        worksheet = self.worksheet_cache.get(title)
+        if worksheet is None:
+            worksheet = self.spreadsheet.worksheet(title)
+            self.worksheet_cache[title] = worksheet
+        return worksheet
+
+    def get_product_headers(self, products: List[Dict]) -> List[str]:
+        """Headers for product rows: PRODUCT_COLUMN_ORDER first, then any other keys
+        (e.g. category, model_variant) in a stable sorted order."""
+        # Specs are only added when the product page parses and model_variant only for
+        # iPhone/iPad, so the first product is not a reliable template - take the union
+        all_headers = set().union(*products)
+        headers = [h for h in PRODUCT_COLUMN_ORDER if h in all_headers]
+        headers.extend(sorted(all_headers.difference(PRODUCT_COLUMN_ORDER)))
+        return headers
+
+    def build_sheet_rows(self, products: List[Dict], headers: List[str]) -> List[List[str]]:
+        """Serialise product dicts to string rows in header order ('' for missing/None values)."""
+        # dtype=object keeps each value as-is, so astype(str) matches str(value) per cell
+        frame = pd.DataFrame(products, dtype=object).reindex(columns=headers)
+        return frame.where(frame.notna(), '').astype(str).to_numpy().tolist()
+
+    def queue_sheet_rewrite(self, worksheet, data: List[List], formats: List[tuple] = ()):
+        """Queue a full rewrite of a worksheet (clear, write data from A1, apply formats).
+        
+        formats is a list of (a1_range, format) pairs, as passed to worksheet.format().
+        Nothing is sent until flush_sheet_writes() is called.
+        """
+        # Clears cell values over the whole sheet, keeping its formatting
+        self.pending_sheet_requests.append({
+            'updateCells': {'range': {'sheetId': worksheet.id}, 'fields': 'userEnteredValue'}
+        })
+        for a1_range, cell_format in formats:
+            self.pending_sheet_requests.append({
+                'repeatCell': {
+                    'range': a1_range_to_grid_range(a1_range, worksheet.id),
+                    'cell': {'userEnteredFormat': cell_format},
+                    'fields': f"userEnteredFormat({','.join(cell_format.keys())})"
+                }
+            })
+        self.pending_value_ranges.append({
+            'range': absolute_range_name(worksheet.title, 'A1'),
+            'values': data
+        })
+        self.pending_sheet_titles.append(worksheet.title)
+
+    def flush_sheet_writes(self) -> bool:
+        """Send all queued sheet rewrites: one batch_update for clears and formatting,
+        then one values_batch_update for the data."""
+        if not self.pending_value_ranges:
+            return True
+        
+        titles = ', '.join(self.pending_sheet_titles)
+        try:
+            self.spreadsheet.batch_update({'requests': self.pending_sheet_requests})
+            self.spreadsheet.values_batch_update({
+                'valueInputOption': 'USER_ENTERED',
+                'data': self.pending_value_ranges
+            })
+            print(f"✅ Wrote {len(self.pending_value_ranges)} sheet(s) in one batch: {titles}")
+            if self.pending_inventory_mirror:
+                self.save_inventory_mirror(self.pending_inventory_mirror)
+            return True
+        except Exception as e:
+            print(f"❌ Failed to write sheets ({titles}): {e}")
+            if self.pending_inventory_mirror:
+                # The sheet may not match any mirror now, so the next run reads the sheet
+                self.remove_inventory_mirror()
+            return False
+        finally:
+            self.pending_sheet_requests = []
+            self.pending_value_ranges = []
+            self.pending_sheet_titles = []
+            self.pending_inventory_mirror = None
+
+    def queue_database_rows(self, standardized_products: List[Dict]):
+        """Queue standardized rows for the database and write every full batch now."""
+        if not self.db_writer:
+            return
+        
+        self.pending_db_rows.extend(standardized_products)
+        while len(self.pending_db_rows) >= DB_WRITE_BATCH_SIZE:
+            batch = [self.pending_db_rows.popleft() for _ in range(DB_WRITE_BATCH_SIZE)]
+            self.db_rows_written += self.db_writer.write_to_apple_history(batch)
+
+    def flush_database_writes(self) -> int:
+        """Write any queued rows left over and return the total written this run."""
+        if self.db_writer and self.pending_db_rows:
+            batch = list(self.pending_db_rows)
+            self.pending_db_rows.clear()
+            self.db_rows_written += self.db_writer.write_to_apple_history(batch)
+        return self.db_rows_written
+
     def ensure_historical_sheets_exist(self):
         """NEW: Create historical tracking sheets if they don't exist."""
         try:
-            existing_sheets = [sheet.title for sheet in self.spreadsheet.worksheets()]
+            # One worksheets() call lists every tab and seeds the handle cache for get_worksheet
+            self.worksheet_cache.update((sheet.title, sheet) for sheet in self.spreadsheet.worksheets())
+            existing_sheets = set(self.worksheet_cache)
+            header_ranges = []  # header rows for new sheets, written together below
             
             # Create Current Inventory sheet if needed
             if CURRENT_SHEET_NAME not in existing_sheets:
                 print(f"🆕 Creating '{CURRENT_SHEET_NAME}' sheet")
-                self.spreadsheet.add_worksheet(title=CURRENT_SHEET_NAME, rows=1000, cols=20)
+                self.worksheet_cache[CURRENT_SHEET_NAME] = self.spreadsheet.add_worksheet(title=CURRENT_SHEET_NAME, rows=1000, cols=20)
             
             # Create Price History sheet if needed
             if PRICE_HISTORY_SHEET_NAME not in existing_sheets:
                 print(f"🆕 Creating '{PRICE_HISTORY_SHEET_NAME}' sheet")
-                price_sheet = self.spreadsheet.add_worksheet(title=PRICE_HISTORY_SHEET_NAME, rows=5000, cols=15)
+                self.worksheet_cache[PRICE_HISTORY_SHEET_NAME] = self.spreadsheet.add_worksheet(title=PRICE_HISTORY_SHEET_NAME, rows=5000, cols=15)
                 # Add headers
                 headers = ['timestamp', 'model_sku', 'name', 'change_type', 'old_price', 'new_price', 'change_amount', 'url']
-                price_sheet.append_row(headers)
+                header_ranges.append({'range': absolute_range_name(PRICE_HISTORY_SHEET_NAME, 'A1'), 'values': [headers]})
             
             # Create Availability History sheet if needed
             if AVAILABILITY_HISTORY_SHEET_NAME not in existing_sheets:
                 print(f"🆕 Creating '{AVAILABILITY_HISTORY_SHEET_NAME}' sheet")
-                avail_sheet = self.spreadsheet.add_worksheet(title=AVAILABILITY_HISTORY_SHEET_NAME, rows=5000, cols=10)
+                self.worksheet_cache[AVAILABILITY_HISTORY_SHEET_NAME] = self.spreadsheet.add_worksheet(title=AVAILABILITY_HISTORY_SHEET_NAME, rows=5000, cols=10)
                 # Add headers
                 headers = ['timestamp', 'model_sku', 'name', 'change_type', 'current_price', 'url']
-                avail_sheet.append_row(headers)
+                header_ranges.append({'range': absolute_range_name(AVAILABILITY_HISTORY_SHEET_NAME, 'A1'), 'values': [headers]})
+            
+            # One values_batch_update for every new header row instead of an append_row each
+            if header_ranges:
+                self.spreadsheet.values_batch_update({'valueInputOption': 'RAW', 'data': header_ranges})
                 
             print("✅ Historical tracking sheets ready")
             
@@ -1149,17 +1487,27 @@ class AppleMacScraperV7Historical:
             print(f"⚠️ Error setting up historical sheets: {e}")
 
     # ALL YOUR EXISTING WORKING METHODS - UNCHANGED
-    def get_page(self, url: str, retries: int = 3) -> Optional[BeautifulSoup]:
-        """Fetch and parse a webpage with retries."""
+    def get_page(self, url: str, retries: int = 3, parse_only: Optional[SoupStrainer] = None) -> Optional[BeautifulSoup]:
+        """Fetch and parse a webpage with retries (only the parse_only part, when given)."""
         for attempt in range(retries):
             try:
+                self.rate_limiter.acquire()
                 response = self.session.get(url, timeout=30)
                 response.raise_for_status()
-                return BeautifulSoup(response.content, 'lxml')
+                self.rate_limiter.recover()
+                # A charset declared in Content-Type (UTF-8 for apple.com) skips bs4's encoding
+                # detection pass; without one, requests' ISO-8859-1 default would override <meta charset>
+                declared = 'charset' in response.headers.get('content-type', '').lower()
+                return BeautifulSoup(response.content, 'lxml', from_encoding=response.encoding if declared else None, parse_only=parse_only)
             except requests.RequestException as e:
                 print(f"❌ Attempt {attempt + 1} failed: {e}")
+                # Rate limiting or overload slows every worker down, not just this one
+                if e.response is not None and e.response.status_code in (429, 503):
+                    self.rate_limiter.throttle()
                 if attempt < retries - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
+                    # Honour Retry-After on 429s, otherwise exponential backoff
+                    retry_after = e.response.headers.get('Retry-After', '') if e.response is not None else ''
+                    time.sleep(int(retry_after) if retry_after.isdigit() else 2 ** attempt)
                 else:
                     print(f"❌ Failed to fetch {url} after {retries} attempts")
                     return None
@@ -1212,9 +1560,9 @@ class AppleMacScraperV7Historical:
                 
                 for test_url in test_urls:
                     print(f"   🧪 Testing: {test_url}")
-                    test_soup = self.get_page(test_url)
+                    test_soup = self.get_page(test_url, parse_only=PRODUCT_LINK_STRAINER)
                     if test_soup:
-                        product_links = test_soup.find_all('a', href=re.compile(r'/uk/shop/product/'))
+                        product_links = test_soup.find_all('a', href=PRODUCT_HREF_PATTERN)
                         print(f"   📱 Found {len(product_links)} product links")
                         if len(product_links) > 10:
                             page_urls.append(test_url)
@@ -1236,20 +1584,21 @@ class AppleMacScraperV7Historical:
         products = []
         
         # Find all product links (this worked in V6)
-        product_links = soup.find_all('a', href=re.compile(r'/uk/shop/product/'))
+        product_links = soup.find_all('a', href=PRODUCT_HREF_PATTERN)
         print(f"🔍 Found {len(product_links)} product links on category page")
         
-        seen_urls = set()
+        # Skip duplicates - the first link for each product URL, in page order
+        links_by_url = {}
+        for link in product_links:
+            links_by_url.setdefault(urljoin(self.base_url, link.get('href', '')), link)
+        
+        # Several links can share a container, so each container's text is built once; the
+        # page itself is serialized at most once (both freed when this page is done)
+        container_texts = {}
+        page_html_cache = {}
         
-        for i, link in enumerate(product_links):
+        for i, (product_url, link) in enumerate(links_by_url.items()):
             try:
-                product_url = urljoin(self.base_url, link.get('href', ''))
-                
-                # Skip duplicates
-                if product_url in seen_urls:
-                    continue
-                seen_urls.add(product_url)
-                
                 product_name = link.get_text(strip=True)
                 
                 # Skip if product name is too short (likely navigation)
@@ -1263,7 +1612,7 @@ class AppleMacScraperV7Historical:
                 model_sku = url_parts[4] if len(url_parts) > 4 else None
                 
                 # Extract price from the category page around this link
-                prices = self.extract_price_near_link(link, soup)
+                prices = self.extract_price_near_link(link, soup, container_texts, page_html_cache)
                 
                 print(f"   💰 Price found: £{prices.get('current_price', 'N/A')}")
                 
@@ -1286,8 +1635,18 @@ class AppleMacScraperV7Historical:
         
         return products
 
-    def extract_price_near_link(self, link, soup) -> Dict:
-        """UNCHANGED: Your working price extraction method."""
+    def extract_price_near_link(self, link, soup, container_texts: Dict[int, str] = None,
+                                page_html_cache: Dict[int, str] = None) -> Dict:
+        """UNCHANGED: Your working price extraction method.
+        
+        container_texts maps id(element) -> get_text() for the page being parsed, so
+        containers shared by several links are only flattened once. page_html_cache
+        maps id(soup) -> str(soup) the same way, so the page is serialized once.
+        """
+        if container_texts is None:
+            container_texts = {}
+        if page_html_cache is None:
+            page_html_cache = {}
         prices = {
             'current_price': None,
             'original_price': None,
@@ -1299,7 +1658,9 @@ class AppleMacScraperV7Historical:
             # Method 1: Look in the same parent container as the link
             parent = link.find_parent(['div', 'section', 'article', 'li'])
             if parent:
-                parent_text = parent.get_text()
+                parent_text = container_texts.get(id(parent))
+                if parent_text is None:
+                    parent_text = container_texts[id(parent)] = parent.get_text()
                 prices = self.extract_prices_from_text(parent_text)
                 if prices.get('current_price'):
                     return prices
@@ -1309,7 +1670,9 @@ class AppleMacScraperV7Historical:
             attempts = 0
             while next_sibling and attempts < 3:
                 if hasattr(next_sibling, 'get_text'):
-                    sibling_text = next_sibling.get_text()
+                    sibling_text = container_texts.get(id(next_sibling))
+                    if sibling_text is None:
+                        sibling_text = container_texts[id(next_sibling)] = next_sibling.get_text()
                     prices = self.extract_prices_from_text(sibling_text)
                     if prices.get('current_price'):
                         return prices
@@ -1320,11 +1683,15 @@ class AppleMacScraperV7Historical:
                 next_sibling = next_sibling.next_sibling
                 attempts += 1
             
-            # Method 3: Look at the surrounding text in a wider area
-            link_position = str(soup).find(str(link))
+            # Method 3: Look at the surrounding text in a wider area (the page is
+            # serialized once and shared by every link on it)
+            page_html = page_html_cache.get(id(soup))
+            if page_html is None:
+                page_html = page_html_cache[id(soup)] = str(soup)
+            link_position = page_html.find(str(link))
             if link_position != -1:
                 # Get text within 500 characters after the link
-                surrounding_html = str(soup)[link_position:link_position + 500]
+                surrounding_html = page_html[link_position:link_position + 500]
                 # Extract just the text
                 temp_soup = BeautifulSoup(surrounding_html, 'lxml')
                 surrounding_text = temp_soup.get_text()
@@ -1346,32 +1713,27 @@ class AppleMacScraperV7Historical:
             'discount_percentage': None
         }
         
-        if not price_text or len(price_text.strip()) == 0:
+        # No pound sign means no prices; skip the cleanup passes entirely
+        if not price_text or '£' not in price_text:
             return prices
         
         try:
-            # Clean up the text - remove HTML tags and normalize whitespace
-            clean_text = re.sub(r'<[^>]+>', '', price_text)
-            clean_text = re.sub(r'\s+', ' ', clean_text.strip())
-            
-            # Remove common words that aren't prices
-            clean_text = re.sub(r'\b(Now|Was|Save|visuallyhidden|span|class)\b', '', clean_text, flags=re.IGNORECASE)
+            # Only tags can hide a price (e.g. "£<span>1,699</span>"); words and spacing around
+            # the pound sign don't affect the match, so no other cleanup is needed
+            if '<' in price_text:
+                price_text = HTML_TAG_PATTERN.sub('', price_text)
             
-            # Find all price values
-            price_matches = re.findall(r'£([\d,]+(?:\.\d{2})?)', clean_text)
-            
-            if not price_matches:
-                return prices
-            
-            # Convert to float values and filter reasonable prices
+            # One scan, keeping the first three reasonable prices (all the patterns below use)
             price_values = []
-            for match in price_matches:
+            for match in PRICE_PATTERN.finditer(price_text):
                 try:
-                    value = float(match.replace(',', ''))
-                    if 200 <= value <= 20000:  # Reasonable range for Apple products
-                        price_values.append(value)
-                except:
+                    value = float(match.group(1).replace(',', ''))
+                except ValueError:
                     continue
+                if 200 <= value <= 20000:  # Reasonable range for Apple products
+                    price_values.append(value)
+                    if len(price_values) == 3:
+                        break
             
             if not price_values:
                 return prices
@@ -1424,109 +1786,64 @@ class AppleMacScraperV7Historical:
         if not product_url:
             return product
         
-        print(f"🔍 Getting detailed specs for: {product.get('name', 'Unknown')[:50]}...")
-        
-        soup = self.get_page(product_url)
+        soup = self.get_page(product_url, parse_only=PRODUCT_PAGE_STRAINER)
         if not soup:
             print(f"❌ Could not fetch product page")
             return product
         
         try:
             # Initialize spec fields
-            specs = {
-                'memory': None,
-                'storage': None,
-                'chip': None,
-                'display_size': None,
-                'color': None,
-                'connectivity': None,
-                'cpu_cores': None,
-                'gpu_cores': None
-            }
+            specs = dict.fromkeys(SPEC_FIELDS)
             
             # Get all page text for analysis
             page_text = soup.get_text()
             product_name = product.get('name', '')
+            product_name_lower = product_name.lower()
             
             # STORAGE EXTRACTION (unchanged from your working version)
-            storage_patterns = [
-                r'(\d+(?:GB|TB))\s+SSD',
-                r'(\d+(?:GB|TB))\s+storage',
-                r'Storage[:\s]+(\d+(?:GB|TB))',
-                r'(\d+(?:GB|TB))\s+internal storage',
-                r'(\d+(?:GB|TB))\s+of storage',
-                r'with\s+(\d+(?:GB|TB))\s+SSD',
-                r'includes\s+(\d+(?:GB|TB))',
-                r'featuring\s+(\d+(?:GB|TB))',
-                r'(\d+(?:GB|TB))\s*-\s*',
-                r'-\s*(\d+(?:GB|TB))',
-                r'Capacity[:\s]*(\d+(?:GB|TB))',
-                r'Flash Storage[:\s]*(\d+(?:GB|TB))'
-            ]
-            
             combined_text = f"{product_name} {page_text}"
+            has_sizes = SIZE_TOKEN_PATTERN.search(combined_text) is not None
             
-            for pattern in storage_patterns:
-                storage_match = re.search(pattern, combined_text, re.IGNORECASE)
+            for pattern in STORAGE_PATTERNS if has_sizes else ():
+                storage_match = pattern.search(combined_text)
                 if storage_match:
                     storage_candidate = storage_match.group(1)
-                    storage_num = int(re.search(r'\d+', storage_candidate).group())
-                    storage_unit = re.search(r'[GT]B', storage_candidate).group()
+                    storage_num = int(SPEC_NUMBER_PATTERN.search(storage_candidate).group())
+                    storage_unit = STORAGE_UNIT_PATTERN.search(storage_candidate).group()
                     
                     if (storage_unit == 'GB' and storage_num >= 256) or (storage_unit == 'TB' and storage_num <= 8):
                         specs['storage'] = storage_candidate
                         break
             
             # MEMORY EXTRACTION (unchanged)
-            memory_patterns = [
-                r'(\d+GB)\s+unified memory',
-                r'(\d+GB)\s+memory',
-                r'Memory[:\s]+(\d+GB)',
-                r'with\s+(\d+GB)\s+of\s+unified\s+memory',
-                r'(\d+GB)\s+RAM',
-                r'Unified Memory[:\s]*(\d+GB)'
-            ]
-            
-            for pattern in memory_patterns:
-                memory_match = re.search(pattern, combined_text, re.IGNORECASE)
+            for pattern in MEMORY_PATTERNS if has_sizes else ():
+                memory_match = pattern.search(combined_text)
                 if memory_match:
                     memory_candidate = memory_match.group(1)
-                    memory_num = int(re.search(r'\d+', memory_candidate).group())
+                    memory_num = int(SPEC_NUMBER_PATTERN.search(memory_candidate).group())
                     if 8 <= memory_num <= 128:
                         specs['memory'] = memory_candidate
                         break
             
             # CHIP EXTRACTION (unchanged)
-            chip_patterns = [
-                r'Apple (M\d+(?:\s+Pro|\s+Max|\s+Ultra)?)',
-                r'(M\d+(?:\s+Pro|\s+Max|\s+Ultra)?)\s+[Cc]hip',
-                r'Apple (M\d+)'
-            ]
-            
-            for pattern in chip_patterns:
-                chip_match = re.search(pattern, combined_text, re.IGNORECASE)
+            for pattern in CHIP_PATTERNS:
+                chip_match = pattern.search(combined_text)
                 if chip_match:
                     specs['chip'] = chip_match.group(1)
                     break
             
             # CPU/GPU CORES EXTRACTION (unchanged)
-            cpu_match = re.search(r'(\d+)[\-‑]Core CPU', combined_text, re.IGNORECASE)
+            cpu_match = CPU_CORES_PATTERN.search(combined_text)
             if cpu_match:
                 specs['cpu_cores'] = f"{cpu_match.group(1)}-Core CPU"
             
-            gpu_match = re.search(r'(\d+)[\-‑]Core GPU', combined_text, re.IGNORECASE)
+            gpu_match = GPU_CORES_PATTERN.search(combined_text)
             if gpu_match:
                 specs['gpu_cores'] = f"{gpu_match.group(1)}-Core GPU"
             
             # DISPLAY SIZE EXTRACTION (unchanged)
-            display_patterns = [
-                r'(\d+(?:\.\d+)?[\-‑]inch)',
-                r'(\d+(?:\.\d+)?")',
-                r'(\d+(?:\.\d+)?)\s*inch'
-            ]
-            
-            for pattern in display_patterns:
-                display_match = re.search(pattern, product_name, re.IGNORECASE)
+            for pattern in DISPLAY_PATTERNS:
+                display_match = pattern.search(product_name)
                 if display_match:
                     size = display_match.group(1)
                     if 'inch' not in size:
@@ -1535,50 +1852,49 @@ class AppleMacScraperV7Historical:
                         specs['display_size'] = size
                     break
             
-            # COLOR EXTRACTION - Sky Blue must come before Blue to match correctly
-            color_patterns = [
-                r'[\-\s](Space (?:Grey|Gray|Black))',
-                r'[\-\s](Silver)', r'[\-\s](Gold)', r'[\-\s](Rose Gold)',
-                r'[\-\s](Midnight)', r'[\-\s](Starlight)', r'[\-\s](Sky Blue)',
-                r'[\-\s](Blue)', r'[\-\s](Green)', r'[\-\s](Pink)', r'[\-\s](Purple)',
-                r'[\-\s](Yellow)', r'[\-\s](Orange)', r'[\-\s](Red)'
-            ]
-            
-            for pattern in color_patterns:
-                color_match = re.search(pattern, product_name, re.IGNORECASE)
-                if color_match:
-                    specs['color'] = color_match.group(1).strip()
-                    break
-            
+            # COLOR EXTRACTION - single pass, lowest COLOR_NAMES index wins
+            color_match = None
+            for match in COLOR_PATTERN.finditer(product_name):
+                if color_match is None or match.lastindex < color_match.lastindex:
+                    color_match = match
+            if color_match:
+                specs['color'] = color_match.group(color_match.lastindex).strip()
+
             # CONNECTIVITY EXTRACTION - enhanced for iPad/iPhone
-            if 'Gigabit Ethernet' in combined_text:
+            connectivity_found = set(CONNECTIVITY_PATTERN.findall(combined_text))
+            if 'Gigabit Ethernet' in connectivity_found:
                 specs['connectivity'] = 'Gigabit Ethernet'
-            elif '10Gb Ethernet' in combined_text:
+            elif '10Gb Ethernet' in connectivity_found:
                 specs['connectivity'] = '10Gb Ethernet'
-            elif 'Wi-Fi + Cellular' in combined_text or 'WiFi + Cellular' in combined_text:
+            elif 'Wi-Fi + Cellular' in connectivity_found or 'WiFi + Cellular' in connectivity_found:
                 specs['connectivity'] = 'Wi-Fi + Cellular'
-            elif 'Cellular' in combined_text and ('iPad' in product_name or 'iPhone' in product_name):
+            elif 'Cellular' in connectivity_found and ('iPad' in product_name or 'iPhone' in product_name):
                 specs['connectivity'] = 'Wi-Fi + Cellular'
-            elif 'Wi-Fi' in combined_text:
+            elif 'Wi-Fi' in connectivity_found:
                 specs['connectivity'] = 'Wi-Fi'
             
             # IPHONE/IPAD SPECIFIC: Extract model variant (e.g., iPhone 15 Pro Max, iPad Pro)
-            iphone_match = re.search(r'iPhone\s+(\d+)(?:\s+(Pro|Pro Max|Plus|mini))?', product_name, re.IGNORECASE)
+            # (cheap substring check first - most products are Macs and match neither)
+            iphone_match = 'iphone' in product_name_lower and IPHONE_MODEL_PATTERN.search(product_name)
             if iphone_match:
                 iphone_num = iphone_match.group(1)
                 iphone_variant = iphone_match.group(2) or ''
                 specs['model_variant'] = f"iPhone {iphone_num} {iphone_variant}".strip()
             
-            ipad_match = re.search(r'iPad\s+(Pro|Air|mini)?(?:\s+(\d+(?:\.\d+)?)-?inch)?', product_name, re.IGNORECASE)
+            ipad_match = 'ipad' in product_name_lower and IPAD_MODEL_PATTERN.search(product_name)
             if ipad_match:
                 ipad_type = ipad_match.group(1) or ''
                 specs['model_variant'] = f"iPad {ipad_type}".strip()
             
+            # Spec values come from a small vocabulary repeated across every product -
+            # intern them so equal values share one string object
+            for key, value in specs.items():
+                if value:
+                    specs[key] = sys.intern(value)
+            
             # Add specs to product
             product.update(specs)
             
-            print(f"✅ Extracted specs: {specs['chip'] or 'N/A'} | {specs['memory'] or 'N/A'} | {specs['storage'] or 'N/A'}")
-            
         except Exception as e:
             print(f"❌ Error extracting specs: {e}")
         
@@ -1592,15 +1908,34 @@ class AppleMacScraperV7Historical:
         if not self.google_client:
             return previous_data
             
+        # The local mirror saved by the last run's successful Current Inventory flush saves
+        # the full read, as long as the sheet hasn't been rewritten since (e.g. by the CI run)
+        if INVENTORY_CACHE_FILE and not self.resync_inventory and os.path.exists(INVENTORY_CACHE_FILE):
+            mirror = self.load_inventory_mirror()
+            if mirror is not None:
+                print(f"📊 Loaded {len(mirror)} previous products for comparison (local mirror)")
+                return mirror
+        
         try:
-            current_sheet = self.spreadsheet.worksheet(CURRENT_SHEET_NAME)
-            records = current_sheet.get_all_records()
-            
-            for record in records:
-                model_sku = record.get('model_sku')
-                if model_sku:
-                    previous_data[model_sku] = record
-                    
+            # One raw values.get for the whole tab, keyed straight on model_sku. Going through
+            # the spreadsheet skips the worksheet metadata lookup and gspread's row padding.
+            # Unformatted values give plain numbers for the currency-formatted price columns
+            # (comparable with the mirror's prices); dates stay as their formatted strings.
+            response = self.spreadsheet.values_get(
+                absolute_range_name(CURRENT_SHEET_NAME),
+                params=INVENTORY_READ_PARAMS
+            )
+            values = response.get('values', [])
+            if values and 'model_sku' in values[0]:
+                headers = values[0]
+                sku_idx = headers.index('model_sku')
+                # str() so numeric-looking SKUs still match the SKUs parsed from product URLs
+                previous_data = {
+                    str(row[sku_idx]): dict(zip(headers, row))
+                    for row in values[1:]
+                    if len(row) > sku_idx and row[sku_idx]
+                }
+
             print(f"📊 Loaded {len(previous_data)} previous products for comparison")
             
         except Exception as e:
@@ -1641,36 +1976,32 @@ class AppleMacScraperV7Historical:
                     previous_product.get('current_price'), previous_product.get('url')
                 ])
         
-        # Check for price changes in existing products
-        for sku, current_product in current_lookup.items():
-            if sku in previous_data:
-                previous_product = previous_data[sku]
+        # Check for price changes in existing products - prices for the SKUs present in
+        # both runs are parsed once into parallel float arrays and diffed in one pass;
+        # unparseable prices come out as 0 and are skipped
+        common_skus = np.array([sku for sku in current_lookup if sku in previous_data], dtype=object)
+        if common_skus.size:
+            previous_prices = to_price_array([previous_data[sku].get('current_price') for sku in common_skus])
+            current_prices = to_price_array([current_lookup[sku].get('current_price') for sku in common_skus])
+            changed = diff_prices(current_prices, previous_prices)
+            
+            for sku, previous_price, current_price in zip(common_skus[changed], previous_prices[changed].tolist(), current_prices[changed].tolist()):
+                current_product = current_lookup[sku]
+                change_amount = current_price - previous_price
+                change_type = 'PRICE_INCREASE' if change_amount > 0 else 'PRICE_DECREASE'
                 
-                # Compare prices (convert to float for comparison)
-                try:
-                    current_price = float(current_product.get('current_price', 0) or 0)
-                    previous_price = float(previous_product.get('current_price', 0) or 0)
-                    
-                    if current_price != previous_price and current_price > 0 and previous_price > 0:
-                        change_amount = current_price - previous_price
-                        change_type = 'PRICE_INCREASE' if change_amount > 0 else 'PRICE_DECREASE'
-                        
-                        print(f"💰 PRICE CHANGE: {current_product.get('name', 'Unknown')[:40]}...")
-                        print(f"   £{previous_price} -> £{current_price} ({'+' if change_amount > 0 else ''}£{change_amount:.2f})")
-                        
-                        price_changes.append([
-                            timestamp, sku, current_product.get('name'), change_type,
-                            previous_price, current_price, change_amount, current_product.get('url')
-                        ])
-                        
-                except (ValueError, TypeError):
-                    # Skip if price comparison fails
-                    pass
+                print(f"💰 PRICE CHANGE: {current_product.get('name', 'Unknown')[:40]}...")
+                print(f"   £{previous_price} -> £{current_price} ({'+' if change_amount > 0 else ''}£{change_amount:.2f})")
+                
+                price_changes.append([
+                    timestamp, sku, current_product.get('name'), change_type,
+                    previous_price, current_price, change_amount, current_product.get('url')
+                ])
         
         # Log changes to Google Sheets using BATCH operations
         if price_changes:
             try:
-                price_history_sheet = self.spreadsheet.worksheet(PRICE_HISTORY_SHEET_NAME)
+                price_history_sheet = self.get_worksheet(PRICE_HISTORY_SHEET_NAME)
                 # Batch append all price changes in one API call
                 if len(price_changes) > 0:
                     self.batch_append_to_sheet(price_history_sheet, price_changes)
@@ -1680,7 +2011,7 @@ class AppleMacScraperV7Historical:
         
         if availability_changes:
             try:
-                availability_sheet = self.spreadsheet.worksheet(AVAILABILITY_HISTORY_SHEET_NAME)
+                availability_sheet = self.get_worksheet(AVAILABILITY_HISTORY_SHEET_NAME)
                 # Batch append all availability changes in one API call
                 if len(availability_changes) > 0:
                     self.batch_append_to_sheet(availability_sheet, availability_changes)
@@ -1704,70 +2035,90 @@ class AppleMacScraperV7Historical:
             return
             
         try:
-            current_sheet = self.spreadsheet.worksheet(CURRENT_SHEET_NAME)
-            
-            # Clear existing data
-            current_sheet.clear()
+            current_sheet = self.get_worksheet(CURRENT_SHEET_NAME)
             
             if products:
-                # Get all possible headers
-                all_headers = set()
-                for product in products:
-                    all_headers.update(product.keys())
-                
                 # Order headers logically
-                preferred_order = [
-                    'name', 'chip', 'cpu_cores', 'gpu_cores', 'memory', 'storage',
-                    'display_size', 'color', 'current_price', 'original_price', 
-                    'savings', 'discount_percentage', 'connectivity', 'url', 
-                    'model_sku', 'scraped_at'
-                ]
-                
-                headers = [h for h in preferred_order if h in all_headers]
-                headers.extend([h for h in all_headers if h not in headers])
+                headers = self.get_product_headers(products)
                 
                 # Prepare data rows
-                data = [headers]  # Start with headers
-                
-                for product in products:
-                    row = []
-                    for header in headers:
-                        value = product.get(header, '')
-                        if value is None:
-                            row.append('')
-                        else:
-                            row.append(str(value))
-                    data.append(row)
-                
-                # Upload all data
-                current_sheet.update(data, value_input_option='USER_ENTERED')
+                data = [headers] + self.build_sheet_rows(products, headers)
                 
                 # Format the header row
-                current_sheet.format('A1:Z1', {
+                formats = [('A1:Z1', {
                     'backgroundColor': {'red': 0.2, 'green': 0.2, 'blue': 0.2},
                     'textFormat': {'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}, 'bold': True}
-                })
+                })]
                 
                 # Format price columns as currency
-                try:
-                    price_columns = []
-                    for i, header in enumerate(headers):
-                        if 'price' in header.lower() or 'savings' in header.lower():
-                            price_columns.append(chr(65 + i))
-                    
-                    for col in price_columns:
-                        if ord(col) - 65 < 26:
-                            current_sheet.format(f'{col}2:{col}1000', {
-                                'numberFormat': {'type': 'CURRENCY', 'pattern': '£#,##0.00'}
-                            })
-                except Exception as e:
-                    print(f"⚠️ Could not format currency columns: {e}")
+                for i, header in enumerate(headers, 1):
+                    if 'price' in header.lower() or 'savings' in header.lower():
+                        formats.append((f'{rowcol_to_a1(2, i)}:{rowcol_to_a1(1000, i)}', {
+                            'numberFormat': {'type': 'CURRENCY', 'pattern': '£#,##0.00'}
+                        }))
+                
+                # Clear, upload and format in the end-of-run batch
+                self.queue_sheet_rewrite(current_sheet, data, formats)
+                print(f"📝 Queued Current Inventory update with {len(products)} products")
                 
-                print(f"✅ Updated Current Inventory with {len(products)} products")
+                # Mirrored locally only once flush_sheet_writes() has sent these rows
+                self.pending_inventory_mirror = data
                 
         except Exception as e:
             print(f"❌ Failed to update Current Inventory: {e}")
 
+    def save_inventory_mirror(self, data: List[List[str]]):
+        """Write the Current Inventory rows (header row first) to INVENTORY_CACHE_FILE,
+        keyed on model_sku like load_previous_data, with a marker for load_inventory_mirror."""
+        headers = data[0]
+        if not INVENTORY_CACHE_FILE or 'model_sku' not in headers or 'scraped_at' not in headers or len(data) < 2:
+            return
+        
+        sku_idx = headers.index('model_sku')
+        mirror = {row[sku_idx]: dict(zip(headers, row)) for row in data[1:] if row[sku_idx]}
+        
+        # Marker: the last row's scraped_at cell and the (empty) cell below it, so another
+        # run's rewrite - different timestamps or row count - shows up as a mismatch
+        column = headers.index('scraped_at') + 1
+        marker_range = f'{rowcol_to_a1(len(data), column)}:{rowcol_to_a1(len(data) + 1, column)}'
+        marker = {'range': absolute_range_name(CURRENT_SHEET_NAME, marker_range), 'values': [[data[-1][column - 1]]]}
+        try:
+            with open(INVENTORY_CACHE_FILE, 'w', encoding='utf-8') as f:
+                json.dump({'marker': marker, 'products': mirror}, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"⚠️ Could not write {INVENTORY_CACHE_FILE}: {e}")
+
+    def load_inventory_mirror(self) -> Optional[Dict[str, Dict]]:
+        """Products from INVENTORY_CACHE_FILE, or None when it can't be read or its marker
+        no longer matches Current Inventory (the caller then reads the sheet)."""
+        try:
+            with open(INVENTORY_CACHE_FILE, encoding='utf-8') as f:
+                cached = json.load(f)
+            marker = cached['marker']
+            response = self.spreadsheet.values_get(marker['range'], params=INVENTORY_READ_PARAMS)
+        except Exception as e:
+            print(f"⚠️ Could not use {INVENTORY_CACHE_FILE}, reading the sheet instead: {e}")
+            return None
+        
+        sheet_values = [[str(value) for value in row] for row in response.get('values', [])]
+        if sheet_values != marker['values']:
+            print(f"🔄 Current Inventory changed since {INVENTORY_CACHE_FILE} was saved, reading the sheet")
+            return None
+        return cached['products']
+
+    def remove_inventory_mirror(self):
+        """Delete INVENTORY_CACHE_FILE so the next run reads Current Inventory from the sheet."""
+        if not INVENTORY_CACHE_FILE:
+            return
+        
+        try:
+            os.remove(INVENTORY_CACHE_FILE)
+            print(f"🗑️ Removed {INVENTORY_CACHE_FILE}; the next run will read the sheet")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"⚠️ Could not remove {INVENTORY_CACHE_FILE}: {e}")
+
     def upload_standardized_to_sheets(self, standardized_products: List[Dict]):
         """Upload standardized products to Apple Products Standardized sheet."""
         if not self.google_client or not standardized_products:
@@ -1776,7 +2127,7 @@ class AppleMacScraperV7Historical:
         try:
             # Try to get existing sheet or create new one
             try:
-                standardized_sheet = self.spreadsheet.worksheet("Apple Products Standardized")
+                standardized_sheet = self.get_worksheet("Apple Products Standardized")
                 print(f"📊 Using existing sheet: Apple Products Standardized")
             except:
                 standardized_sheet = self.spreadsheet.add_worksheet(
@@ -1784,12 +2135,9 @@ class AppleMacScraperV7Historical:
                     rows=len(standardized_products) + 100, 
                     cols=25
                 )
+                self.worksheet_cache["Apple Products Standardized"] = standardized_sheet
                 print(f"📊 Created new sheet: Apple Products Standardized")
             
-            # Clear existing data
-            standardized_sheet.clear()
-            print(f"🧹 Cleared existing data")
-            
             # Define standardized headers in correct order
             standardized_headers = [
                 'Title', 'Condition', 'Price', 'Change', 'URL', 'Machine', 'Model', 'Year',
@@ -1798,34 +2146,22 @@ class AppleMacScraperV7Historical:
             ]
             
             # Prepare data with headers
-            data = [standardized_headers]
-            
-            for product in standardized_products:
-                row = []
-                for header in standardized_headers:
-                    value = product.get(header, '')
-                    if value is None:
-                        row.append('')
-                    else:
-                        row.append(str(value))
-                data.append(row)
+            data = [standardized_headers] + self.build_sheet_rows(standardized_products, standardized_headers)
             
-            # Upload all data
-            print(f"📤 Uploading standardized data to Google Sheets...")
-            standardized_sheet.update(data, value_input_option='USER_ENTERED')
-            
-            # Format the header row
-            standardized_sheet.format('A1:U1', {
-                'backgroundColor': {'red': 0.2, 'green': 0.2, 'blue': 0.2},
-                'textFormat': {'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}, 'bold': True}
-            })
-            
-            # Format price column as currency (Column C)
-            standardized_sheet.format('C2:C1000', {
-                'numberFormat': {'type': 'CURRENCY', 'pattern': '£#,##0.00'}
-            })
+            # Clear, upload and format in the end-of-run batch
+            self.queue_sheet_rewrite(standardized_sheet, data, [
+                # Format the header row
+                ('A1:U1', {
+                    'backgroundColor': {'red': 0.2, 'green': 0.2, 'blue': 0.2},
+                    'textFormat': {'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}, 'bold': True}
+                }),
+                # Format price column as currency (Column C)
+                ('C2:C1000', {
+                    'numberFormat': {'type': 'CURRENCY', 'pattern': '£#,##0.00'}
+                })
+            ])
             
-            print(f"✅ Successfully uploaded {len(standardized_products)} standardized products to Google Sheets!")
+            print(f"📝 Queued {len(standardized_products)} standardized products for upload")
             print(f"📊 Sheet: Apple Products Standardized")
             
         except Exception as e:
@@ -1837,37 +2173,14 @@ class AppleMacScraperV7Historical:
             return
             
         try:
-            history_sheet = self.spreadsheet.worksheet("History")
+            history_sheet = self.get_worksheet("History")
             
             if products:
-                # Get all possible headers
-                all_headers = set()
-                for product in products:
-                    all_headers.update(product.keys())
-                
                 # Order headers logically (same as Current Inventory)
-                preferred_order = [
-                    'name', 'chip', 'cpu_cores', 'gpu_cores', 'memory', 'storage',
-                    'display_size', 'color', 'current_price', 'original_price', 
-                    'savings', 'discount_percentage', 'connectivity', 'url', 
-                    'model_sku', 'scraped_at'
-                ]
-                
-                headers = [h for h in preferred_order if h in all_headers]
-                headers.extend([h for h in all_headers if h not in headers])
+                headers = self.get_product_headers(products)
                 
                 # Prepare data rows
-                data = []
-                
-                for product in products:
-                    row = []
-                    for header in headers:
-                        value = product.get(header, '')
-                        if value is None:
-                            row.append('')
-                        else:
-                            row.append(str(value))
-                    data.append(row)
+                data = self.build_sheet_rows(products, headers)
                 
                 # Append all data to History tab (don't clear)
                 self.batch_append_to_sheet(history_sheet, data)
@@ -1885,7 +2198,7 @@ class AppleMacScraperV7Historical:
         try:
             # Try to get existing sheet or create new one
             try:
-                standardized_history_sheet = self.spreadsheet.worksheet("Standardized History")
+                standardized_history_sheet = self.get_worksheet("Standardized History")
                 print(f"📊 Using existing sheet: Standardized History")
             except:
                 standardized_history_sheet = self.spreadsheet.add_worksheet(
@@ -1893,6 +2206,7 @@ class AppleMacScraperV7Historical:
                     rows=5000, 
                     cols=21
                 )
+                self.worksheet_cache["Standardized History"] = standardized_history_sheet
                 print(f"📊 Created new sheet: Standardized History")
                 
                 # Add headers for new sheet
@@ -1918,17 +2232,7 @@ class AppleMacScraperV7Historical:
                 ]
                 
                 # Prepare data rows
-                data = []
-                
-                for product in standardized_products:
-                    row = []
-                    for header in standardized_headers:
-                        value = product.get(header, '')
-                        if value is None:
-                            row.append('')
-                        else:
-                            row.append(str(value))
-                    data.append(row)
+                data = self.build_sheet_rows(standardized_products, standardized_headers)
                 
                 # Append all data to Standardized History tab (don't clear)
                 self.batch_append_to_sheet(standardized_history_sheet, data)
@@ -1950,11 +2254,14 @@ class AppleMacScraperV7Historical:
         all_products = []
         seen_urls = set()
         
-        for page_num, page_url in enumerate(page_urls, 1):
+        # Fetch every page up front with a small worker pool, then process them in order
+        with ThreadPoolExecutor(max_workers=CATEGORY_PAGE_WORKERS) as executor:
+            page_soups = list(executor.map(self.get_page, page_urls))
+        
+        for page_num, (page_url, soup) in enumerate(zip(page_urls, page_soups), 1):
             print(f"\n📄 SCRAPING {category.upper()} PAGE {page_num}/{len(page_urls)}")
             print(f"🔗 URL: {page_url}")
             
-            soup = self.get_page(page_url)
             if not soup:
                 continue
             
@@ -1965,28 +2272,25 @@ class AppleMacScraperV7Historical:
             for product in page_products:
                 product['category'] = category
             
-            # Filter out duplicates
-            new_products = []
-            for product in page_products:
-                if product['url'] not in seen_urls:
-                    seen_urls.add(product['url'])
-                    new_products.append(product)
+            # Filter out duplicates (URLs are already unique within a page)
+            page_by_url = {product['url']: product for product in page_products}
+            new_products = [product for url, product in page_by_url.items() if url not in seen_urls]
+            seen_urls.update(page_by_url)
             
             print(f"📦 Found {len(new_products)} new {category} products with pricing")
             all_products.extend(new_products)
-            
-            # Be respectful between pages
-            time.sleep(2)
         
         print(f"\n🎯 TOTAL {category.upper()} PRODUCTS: {len(all_products)}")
         return all_products
 
-    def scrape_all_mac_products(self, categories: List[str] = None) -> List[Dict]:
+    def scrape_all_mac_products(self, categories: List[str] = None, flush_sheets: bool = True) -> List[Dict]:
         """MAIN SCRAPING METHOD - Now supports Mac, iPad, and iPhone.
         
         Args:
             categories: List of categories to scrape. Defaults to ['mac'] for backward compatibility.
                        Options: 'mac', 'ipad', 'iphone'
+            flush_sheets: Send the queued sheet rewrites before returning. Pass False to
+                       queue more writes and call flush_sheet_writes() yourself.
         """
         if categories is None:
             categories = ['mac']  # Default to Mac only for backward compatibility
@@ -2013,29 +2317,45 @@ class AppleMacScraperV7Historical:
             category_products = self.scrape_category(category)
             
             # Filter out duplicates across categories
-            for product in category_products:
-                if product['url'] not in seen_urls:
-                    seen_urls.add(product['url'])
-                    all_products.append(product)
+            all_products.extend(product for product in category_products if product['url'] not in seen_urls)
+            seen_urls.update(product['url'] for product in category_products)
         
         print(f"\n🎯 TOTAL PRODUCTS WITH PRICING: {len(all_products)}")
-        products_with_prices = len([p for p in all_products if p.get('current_price')])
+        products_with_prices = sum(1 for p in all_products if p.get('current_price'))
         print(f"💰 Products with valid prices: {products_with_prices}/{len(all_products)}")
         
         # STEP 2: Extract detailed specs from individual product pages (unchanged)
         print(f"\n🔍 STEP 2: EXTRACTING DETAILED SPECS FROM PRODUCT PAGES")
         print("=" * 60)
         
-        detailed_products = []
-        for i, product in enumerate(all_products, 1):
-            print(f"\n📱 [{i}/{len(all_products)}] Processing: {product.get('name', 'Unknown')[:50]}...")
-            
-            # Extract detailed specs (pricing already done)
-            detailed_product = self.extract_detailed_specs(product)
-            detailed_products.append(detailed_product)
-            
-            # Be respectful between product pages
-            time.sleep(0.5)
+        # Products already in Current Inventory keep their specs; only new product pages are
+        # fetched. Prices always come from this run's category pages
+        new_products = []
+        for product in all_products:
+            previous_product = previous_data.get(product.get('model_sku'))
+            specs = {field: previous_product.get(field) or None for field in SPEC_FIELDS} if previous_product else None
+            if specs and any(specs.values()):
+                product.update(specs)
+                if previous_product.get('model_variant'):
+                    product['model_variant'] = previous_product['model_variant']
+            else:
+                new_products.append(product)
+        
+        if len(new_products) < len(all_products):
+            print(f"♻️ Reusing specs for {len(all_products) - len(new_products)} products already in Current Inventory")
+        
+        # Fetch and parse the new product pages with a small worker pool (pricing already
+        # done); extract_detailed_specs updates each product in place
+        with ThreadPoolExecutor(max_workers=PRODUCT_PAGE_WORKERS) as executor:
+            list(executor.map(self.extract_detailed_specs, new_products))
+        detailed_products = all_products
+        
+        # One status line per product (stdout is unbuffered in the container, so
+        # every print is a write syscall)
+        for i, detailed_product in enumerate(detailed_products, 1):
+            print(f"📱 [{i}/{len(all_products)}] {detailed_product.get('name', 'Unknown')[:50]} | "
+                  f"{detailed_product.get('chip') or 'N/A'} | {detailed_product.get('memory') or 'N/A'} | "
+                  f"{detailed_product.get('storage') or 'N/A'}")
         
         # NEW: STEP 3: Generate standardized format
         print(f"\n🔄 STEP 3: GENERATING STANDARDIZED FORMAT")
@@ -2043,6 +2363,9 @@ class AppleMacScraperV7Historical:
         standardized_products = self.standardizer.standardize_apple_data(detailed_products)
         print(f"✅ Standardized {len(standardized_products)} products for dashboard")
         
+        # Full database batches go out now, ahead of the Sheets steps
+        self.queue_database_rows(standardized_products)
+        
         # NEW: STEP 4: Detect and log changes
         print(f"\n📊 STEP 4: HISTORICAL CHANGE DETECTION")
         print("=" * 60)
@@ -2069,6 +2392,10 @@ class AppleMacScraperV7Historical:
         print("=" * 60)
         self.update_standardized_history_tab(standardized_products)
         
+        # Send the queued Current Inventory / Standardized rewrites in one batch
+        if self.google_client and flush_sheets:
+            self.flush_sheet_writes()
+        
         # Store standardized products for database write
         self.standardized_products = standardized_products
         
@@ -2081,28 +2408,19 @@ class AppleMacScraperV7Historical:
             print("❌ No products to save")
             return None
         
-        df = pd.DataFrame(products)
-        
-        # Reorder columns for better readability
-        preferred_order = [
-            'name', 'chip', 'cpu_cores', 'gpu_cores', 'memory', 'storage', 
-            'display_size', 'color', 'current_price', 'original_price', 
-            'savings', 'discount_percentage', 'connectivity', 'url', 
-            'model_sku', 'scraped_at'
-        ]
-        
-        # Only include columns that exist
-        existing_columns = [col for col in preferred_order if col in df.columns]
-        remaining_columns = [col for col in df.columns if col not in existing_columns]
-        final_columns = existing_columns + remaining_columns
-        
-        df = df[final_columns]
-        df.to_csv(filename, index=False)
+        # Stream rows straight from the dicts, columns in the same order as the sheets
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=self.get_product_headers(products), extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(products)
         print(f"💾 Saved {len(products)} products to {filename}")
         return filename
 
-    def upload_to_google_sheets(self, products: List[Dict]) -> bool:
-        """MODIFIED: Upload to the original sheet (for compatibility)."""
+    def upload_to_google_sheets(self, products: List[Dict], flush: bool = True) -> bool:
+        """MODIFIED: Upload to the original sheet (for compatibility).
+        
+        With flush=False the rewrite is only queued for the next flush_sheet_writes().
+        """
         if not self.google_client:
             print("❌ Google Sheets not available")
             return False
@@ -2117,63 +2435,34 @@ class AppleMacScraperV7Historical:
             # Get the first sheet (original sheet)
             sheet = self.spreadsheet.sheet1
             
-            # Clear existing data
-            sheet.clear()
-            
             # Prepare data for upload (same as your original code)
             if products:
-                # Get all possible headers
-                all_headers = set()
-                for product in products:
-                    all_headers.update(product.keys())
-                
                 # Order headers logically
-                preferred_order = [
-                    'name', 'chip', 'cpu_cores', 'gpu_cores', 'memory', 'storage',
-                    'display_size', 'color', 'current_price', 'original_price', 
-                    'savings', 'discount_percentage', 'connectivity', 'url', 
-                    'model_sku', 'scraped_at'
-                ]
-                
-                headers = [h for h in preferred_order if h in all_headers]
-                headers.extend([h for h in all_headers if h not in headers])
+                headers = self.get_product_headers(products)
                 
                 # Prepare data rows
-                data = [headers]  # Start with headers
-                
-                for product in products:
-                    row = []
-                    for header in headers:
-                        value = product.get(header, '')
-                        if value is None:
-                            row.append('')
-                        else:
-                            row.append(str(value))
-                    data.append(row)
-                
-                # Upload all data
-                sheet.update(data, value_input_option='USER_ENTERED')
+                data = [headers] + self.build_sheet_rows(products, headers)
                 
                 # Format the header row
-                sheet.format('A1:Z1', {
+                formats = [('A1:Z1', {
                     'backgroundColor': {'red': 0.2, 'green': 0.2, 'blue': 0.2},
                     'textFormat': {'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}, 'bold': True}
-                })
+                })]
                 
                 # Format price columns as currency
-                try:
-                    price_columns = []
-                    for i, header in enumerate(headers):
-                        if 'price' in header.lower() or 'savings' in header.lower():
-                            price_columns.append(chr(65 + i))
-                    
-                    for col in price_columns:
-                        if ord(col) - 65 < 26:
-                            sheet.format(f'{col}2:{col}1000', {
-                                'numberFormat': {'type': 'CURRENCY', 'pattern': '£#,##0.00'}
-                            })
-                except Exception as e:
-                    print(f"⚠️ Could not format currency columns: {e}")
+                for i, header in enumerate(headers, 1):
+                    if 'price' in header.lower() or 'savings' in header.lower():
+                        formats.append((f'{rowcol_to_a1(2, i)}:{rowcol_to_a1(1000, i)}', {
+                            'numberFormat': {'type': 'CURRENCY', 'pattern': '£#,##0.00'}
+                        }))
+                
+                # Clear, upload and format in one batch
+                self.queue_sheet_rewrite(sheet, data, formats)
+                if not flush:
+                    print(f"📝 Queued original sheet update")
+                    return True
+                if not self.flush_sheet_writes():
+                    return False
                 
                 print(f"✅ Successfully updated original sheet!")
                 return True
@@ -2182,64 +2471,113 @@ class AppleMacScraperV7Historical:
             print(f"❌ Failed to upload to original sheet: {e}")
             return False
 
+    def summarize_products(self, products: List[Dict]) -> tuple:
+        """Summary totals, specs coverage and best deal in a single pass over the products."""
+        specs_coverage = dict.fromkeys(SUMMARY_SPEC_FIELDS, 0)
+        priced_count = 0
+        total_value = 0
+        savings_count = 0
+        total_savings = 0
+        total_discount = 0
+        best_deal = None
+        best_deal_savings = None
+        
+        for p in products:
+            get = p.get  # bound once, reused for every field below
+            current_price = get('current_price')
+            if current_price:
+                priced_count += 1
+                total_value += current_price
+            
+            savings = get('savings')
+            if savings:
+                savings_count += 1
+                total_savings += savings
+                total_discount += get('discount_percentage', 0)
+                if best_deal is None or savings > best_deal_savings:
+                    best_deal, best_deal_savings = p, savings
+            
+            for spec in SUMMARY_SPEC_FIELDS:
+                if get(spec):
+                    specs_coverage[spec] += 1
+        
+        avg_discount = total_discount / savings_count if savings_count else 0
+        return priced_count, total_value, total_savings, avg_discount, specs_coverage, best_deal
+
+    def summarize_products_frame(self, products: List[Dict]) -> tuple:
+        """Same as summarize_products, as column operations for large catalogs."""
+        df = pd.DataFrame(products, columns=['current_price', 'savings', 'discount_percentage', *SUMMARY_SPEC_FIELDS])
+        prices = pd.to_numeric(df['current_price'], errors='coerce').fillna(0)
+        savings = pd.to_numeric(df['savings'], errors='coerce').fillna(0)
+        has_savings = savings != 0
+        
+        specs_coverage = {
+            spec: int(count)
+            for spec, count in df[list(SUMMARY_SPEC_FIELDS)].fillna('').astype(bool).sum().items()
+        }
+        
+        best_deal = None
+        avg_discount = 0.0
+        if has_savings.any():
+            best_deal = products[savings[has_savings].idxmax()]
+            avg_discount = float(pd.to_numeric(df.loc[has_savings, 'discount_percentage'], errors='coerce').fillna(0).mean())
+        
+        # Plain Python numbers, so print_summary formats them like the loop path's results
+        return int((prices != 0).sum()), float(prices.sum()), float(savings.sum()), avg_discount, specs_coverage, best_deal
+
     def print_summary(self, products: List[Dict]):
         """ENHANCED: Your original summary + historical info."""
         if not products:
             print("\n❌ No products found")
             return
         
-        print(f"\n🎉 SCRAPING COMPLETE!")
-        print(f"=" * 60)
-        print(f"📊 Total products found: {len(products)}")
-        
-        # Calculate totals (unchanged)
-        products_with_prices = [p for p in products if p.get('current_price')]
-        total_value = sum(p.get('current_price', 0) for p in products_with_prices)
-        total_savings = sum(p.get('savings', 0) for p in products if p.get('savings'))
-        
-        products_with_savings = [p for p in products if p.get('savings')]
-        avg_discount = sum(p.get('discount_percentage', 0) for p in products_with_savings) / len(products_with_savings) if products_with_savings else 0
-        
-        print(f"💰 Products with pricing: {len(products_with_prices)}/{len(products)} ({len(products_with_prices)/len(products)*100:.1f}%)")
-        print(f"💰 Total catalog value: £{total_value:,.2f}")
-        print(f"💸 Total potential savings: £{total_savings:,.2f}")
-        print(f"📈 Average discount: {avg_discount:.1f}%")
+        # Calculate totals and specs coverage
+        if len(products) > SUMMARY_FRAME_THRESHOLD:
+            stats = self.summarize_products_frame(products)
+        else:
+            stats = self.summarize_products(products)
+        priced_count, total_value, total_savings, avg_discount, specs_coverage, best_deal = stats
+        product_count = len(products)
+        percent_per_product = 100 / product_count
+        
+        # Collect the report and write it in one go
+        lines = [SUMMARY_TEMPLATE.format_map({
+            'product_count': product_count,
+            'priced_count': priced_count,
+            'priced_percent': priced_count * percent_per_product,
+            'total_value': total_value,
+            'total_savings': total_savings,
+            'avg_discount': avg_discount,
+        })]
         
         # Specs coverage (unchanged)
-        print(f"\n🔧 Specs coverage:")
-        specs_coverage = {
-            'memory': len([p for p in products if p.get('memory')]),
-            'storage': len([p for p in products if p.get('storage')]),
-            'chip': len([p for p in products if p.get('chip')]),
-            'color': len([p for p in products if p.get('color')])
-        }
-        
-        for spec, count in specs_coverage.items():
-            percentage = (count / len(products)) * 100
-            print(f"   {spec.title()}: {count}/{len(products)} ({percentage:.1f}%)")
+        for label, count in zip(SUMMARY_SPEC_LABELS, specs_coverage.values()):
+            lines.append(SPEC_COVERAGE_TEMPLATE.format_map({
+                'label': label, 'count': count, 'product_count': product_count,
+                'percent': count * percent_per_product,
+            }))
         
         # Best deals (unchanged)
-        if products_with_savings:
-            best_saving = max(products_with_savings, key=lambda x: x.get('savings', 0))
-            print(f"\n🏆 BEST DEAL:")
-            print(f"💰 {best_saving.get('name', 'Unknown')[:60]}...")
-            print(f"    £{best_saving.get('current_price', 0)} (save £{best_saving.get('savings', 0)})")
+        if best_deal:
+            lines.append(BEST_DEAL_TEMPLATE.format_map({
+                'name': best_deal.get('name', 'Unknown')[:60],
+                'current_price': best_deal.get('current_price', 0),
+                'savings': best_deal.get('savings', 0),
+            }))
         
         # NEW: Historical tracking summary  
-        print(f"\n📊 HISTORICAL TRACKING:")
-        print(f"   📋 Current Inventory: Updated with latest data")
-        print(f"   📈 Price History: Tracking all price changes over time")
-        print(f"   📦 Availability History: Tracking products appearing/disappearing")
-        print(f"   🎯 Standardized History: Tracking standardized format over time")
-        print(f"   🔗 View data: https://docs.google.com/spreadsheets/d/{GOOGLE_SHEET_ID}")
+        lines.append(HISTORICAL_TRACKING_SUMMARY)
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
-def main(categories: List[str] = None):
+def main(categories: List[str] = None, resync: bool = False):
     """Main function to run the historical scraper.
     
     Args:
         categories: List of categories to scrape. Options: 'mac', 'ipad', 'iphone'
                    Defaults to ['mac', 'ipad', 'iphone'] to scrape all.
+        resync: Read previous data from the Current Inventory sheet instead of the
+                local INVENTORY_CACHE_FILE mirror (e.g. after editing the sheet by hand).
     """
     if categories is None:
         # Default: scrape all categories
@@ -2251,75 +2589,94 @@ def main(categories: List[str] = None):
     print(f"📋 Categories: {', '.join(categories)}")
     
     scraper = AppleMacScraperV7Historical()
+    scraper.resync_inventory = resync
     
     # Initialize database writer for dual-write
     db_writer = None
     if DATABASE_AVAILABLE:
         db_writer = DatabaseWriter()
     
+    # Neither changes during the run - check once
+    has_sheets = bool(scraper.google_client)
+    has_db = bool(db_writer and db_writer.enabled)
+    
     # Check Google Sheets setup
-    if scraper.google_client:
+    if has_sheets:
         print(f"📊 Google Sheets: ✅ Ready")
         print(f"📋 Historical Tracking: ✅ Ready")
     else:
         print(f"📊 Google Sheets: ❌ Not available")
     
     # Check database setup
-    if db_writer and db_writer.enabled:
+    if has_db:
         print(f"💾 Database: ✅ Ready (dual-write enabled)")
     else:
         print(f"💾 Database: ❌ Not available (Sheets only)")
     
-    print(f"\n⏰ Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"\n⏰ Started at: {datetime.now().isoformat(sep=' ', timespec='seconds')}")
     
-    # Scrape products from specified categories
-    products = scraper.scrape_all_mac_products(categories=categories)
+    if has_db:
+        scraper.db_writer = db_writer
     
-    # Print comprehensive summary
-    scraper.print_summary(products)
-    
-    # Save results
-    if products:
+    try:
+        # Scrape products from specified categories (sheet rewrites stay queued so the
+        # original sheet can join them in a single batch below)
+        products = scraper.scrape_all_mac_products(categories=categories, flush_sheets=False)
+        
+        # Print comprehensive summary
+        scraper.print_summary(products)
+        
+        # Nothing scraped - nothing to save, upload or write
+        if not products:
+            print(f"\n⏰ Finished at: {datetime.now().isoformat(sep=' ', timespec='seconds')}")
+            return products
+        
+        # Save results
         print(f"\n💾 Saving data...")
         csv_file = scraper.save_to_csv(products)
         
-        # Upload to original Google Sheet (for compatibility)
-        if scraper.google_client:
-            scraper.upload_to_google_sheets(products)
-            
-            # Standardized format already uploaded during scraping process
-            print(f"\n✅ Standardized format already uploaded during scraping")
-        else:
-            print("💡 Enable Google Sheets to automatically sync data")
-        
-        # Write standardized products to database (dual-write)
-        if db_writer and db_writer.enabled and hasattr(scraper, 'standardized_products'):
-            print(f"\n💾 Writing to database...")
-            count = db_writer.write_to_apple_history(scraper.standardized_products)
-            if count > 0:
-                print(f"✅ Written {count} products to database")
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Upload to original Google Sheet (for compatibility), together with the
+            # Current Inventory and Standardized rewrites queued during scraping. The
+            # batch is sent in the background so the database write overlaps it.
+            sheets_future = None
+            if has_sheets:
+                scraper.upload_to_google_sheets(products, flush=False)
+                sheets_future = executor.submit(scraper.flush_sheet_writes)
+            else:
+                print("💡 Enable Google Sheets to automatically sync data")
+            
+            # Write the remaining standardized products to database (dual-write)
+            if has_db:
+                print(f"\n💾 Writing to database...")
+                count = scraper.flush_database_writes()
+                if count > 0:
+                    print(f"✅ Written {count} products to database")
+            
+            if sheets_future:
+                sheets_future.result()
+    finally:
+        # Close exactly once, however the run ended
+        if has_db:
             db_writer.close()
-        
-        print(f"\n✅ All done! Found {len(products)} products with historical tracking")
-        if csv_file:
-            print(f"📄 Local file: {csv_file}")
-        if scraper.google_client:
-            print(f"📊 Original Sheet: {GOOGLE_SHEET_NAME}")
-            print(f"📋 Current Inventory: {CURRENT_SHEET_NAME}")
-            print(f"📈 Price History: {PRICE_HISTORY_SHEET_NAME}")
-            print(f"📦 Availability History: {AVAILABILITY_HISTORY_SHEET_NAME}")
-            print(f"🎯 Standardized Sheet: Apple Products Standardized")
-            print(f"📊 Standardized History: Standardized History")
     
-    print(f"\n⏰ Finished at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"\n✅ All done! Found {len(products)} products with historical tracking")
+    if csv_file:
+        print(f"📄 Local file: {csv_file}")
+    if has_sheets:
+        print(f"📊 Original Sheet: {GOOGLE_SHEET_NAME}")
+        print(f"📋 Current Inventory: {CURRENT_SHEET_NAME}")
+        print(f"📈 Price History: {PRICE_HISTORY_SHEET_NAME}")
+        print(f"📦 Availability History: {AVAILABILITY_HISTORY_SHEET_NAME}")
+        print(f"🎯 Standardized Sheet: Apple Products Standardized")
+        print(f"📊 Standardized History: Standardized History")
+    
+    print(f"\n⏰ Finished at: {datetime.now().isoformat(sep=' ', timespec='seconds')}")
     return products
 
-
 if __name__ == "__main__":
-    import sys
-    
     # Parse command line arguments for categories
-    # Usage: python histv7.py [categories]
+    # Usage: python histv7.py [categories] [--resync]
     # Examples:
     #   python histv7.py                    # Scrape all (mac, ipad, iphone)
     #   python histv7.py mac                # Scrape Mac only
@@ -2327,9 +2684,12 @@ if __name__ == "__main__":
     #   python histv7.py iphone             # Scrape iPhone only
     #   python histv7.py mac ipad           # Scrape Mac and iPad
     #   python histv7.py mac ipad iphone    # Scrape all
+    #   python histv7.py --resync           # Compare against the sheet, not the local mirror
     
-    if len(sys.argv) > 1:
-        categories = [arg.lower() for arg in sys.argv[1:] if arg.lower() in ['mac', 'ipad', 'iphone']]
+    resync = '--resync' in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != '--resync']
+    if args:
+        categories = [arg.lower() for arg in args if arg.lower() in ['mac', 'ipad', 'iphone']]
         if not categories:
             print("⚠️ Invalid categories. Valid options: mac, ipad, iphone")
             print("   Using default: all categories")
@@ -2337,4 +2697,4 @@ if __name__ == "__main__":
     else:
         categories = None  # Default to all
     
-    products = main(categories=categories)
\ No newline at end of file
+    products = main(categories=categories, resync=resync)
\ No newline at end of file
@@ -8,28 +8,37 @@ This version fixes the major pricing issue by using a hybrid approach:
 3. Match them together using product identifiers
 
 SETUP INSTRUCTIONS:
-1. Install required packages: pip3 install requests beautifulsoup4 lxml pandas gspread oauth2client
+1. Install required packages: pip3 install requests beautifulsoup4 lxml gspread oauth2client
 2. Put your credentials.json file in the same folder as this script
 3. Enable Google Drive API and Google Sheets API in Google Cloud Console
 
 Dependencies:
-    pip3 install requests beautifulsoup4 lxml pandas gspread oauth2client
+    pip3 install requests beautifulsoup4 lxml gspread oauth2client
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import re
+import html
 import json
+import csv
 import time
 import os
+import gzip
+import hashlib
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from urllib.parse import urljoin, urlparse, parse_qs
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import html as lxml_html
 from typing import List, Dict, Optional, Set
-import pandas as pd
 
 # Google Sheets integration
 try:
     import gspread
+    from gspread.utils import a1_range_to_grid_range, rowcol_to_a1
     from oauth2client.service_account import ServiceAccountCredentials
     GOOGLE_SHEETS_AVAILABLE = True
 except ImportError:
@@ -41,6 +50,236 @@ GOOGLE_SHEET_NAME = "Apple Mac Products V3"  # Using your existing Google Sheet
 GOOGLE_SHEET_ID = "1j7npqR9I303etrf67HYkXU6m87DEwg66j0dmqxpMllQ"  # Your specific sheet ID
 CREDENTIALS_FILE = "credentials.json"  # Make sure this file is in the same folder
 
+# Column order for the CSV and the sheet (any other keys follow)
+PRODUCT_COLUMN_ORDER = [
+    'name', 'chip', 'cpu_cores', 'gpu_cores', 'memory', 'storage',
+    'display_size', 'color', 'current_price', 'original_price',
+    'savings', 'discount_percentage', 'connectivity', 'url',
+    'model_sku', 'scraped_at'
+]
+
+# Product pages fetched in parallel (kept small to stay polite to apple.com)
+PRODUCT_PAGE_WORKERS = 4
+
+# Pages are kept on disk between runs and revalidated with ETag / Last-Modified, so unchanged
+# pages come back as a bodyless 304; pages not requested or listed in a run are pruned after it
+# (set to None to disable)
+PAGE_CACHE_DIR = ".page_cache"
+
+# Fields every product gets from parse_specs (None when not found)
+SPEC_FIELDS = (
+    'memory', 'storage', 'chip', 'display_size',
+    'color', 'connectivity', 'cpu_cores', 'gpu_cores'
+)
+
+# Politeness limit shared by every request (category, probe and product pages alike)
+REQUESTS_PER_SECOND = 4
+
+# Processes running parse_specs on fetched product pages (regex work is CPU-bound)
+SPEC_PROCESS_WORKERS = os.cpu_count() or 1
+
+# The spec processes start while fetch threads are running, so they must not be forked from
+# this process (a child can inherit a lock held mid-request); forkserver where available
+SPEC_PROCESS_CONTEXT = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn')
+
+# Category pages are parsed with lxml directly; they only need page text and product links
+PAGE_TEXT_XPATH = '//text()[not(ancestor::script or ancestor::style or ancestor::template)]'
+PRODUCT_LINK_XPATH = '//a[contains(@href, "/uk/shop/product/")]'
+PRODUCT_CONTAINER_XPATH = 'ancestor::*[self::div or self::section or self::article][1]'
+
+# Pagination discovery reads <a> tags straight from the response bytes
+ANCHOR_TAG_PATTERN = re.compile(rb'<a\s[^>]*>', re.IGNORECASE)
+ANCHOR_ATTR_PATTERN = re.compile(rb'(?<![\w-])(href|aria-label)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))', re.IGNORECASE)
+PRODUCT_HREF = '/uk/shop/product/'
+
+# Category pages embed the whole product grid as JSON after this assignment
+CATALOG_JSON_MARKER = b'window.REFURB_GRID_BOOTSTRAP ='
+
+# Apple's text listing format: "[Product Name](URL)Price Text - ", one entry per '[' section
+PRODUCT_LISTING_PATTERN = re.compile(r'(?:\A|\[)([^\[]*?)\]\(([^\[)]*)\)([^\[]*?)(?= -|\[|\Z)')
+
+# Product pages are only read for their visible text, so <head> (meta, link and script tags)
+# is never built into the soup
+PRODUCT_PAGE_STRAINER = SoupStrainer('body')
+
+# Spec patterns for extract_detailed_specs, in priority order (first match wins)
+STORAGE_PATTERNS = [re.compile(p, re.IGNORECASE) for p in [
+    r'(\d+(?:GB|TB))\s+SSD',
+    r'(\d+(?:GB|TB))\s+storage',
+    r'Storage[:\s]+(\d+(?:GB|TB))',
+    r'(\d+(?:GB|TB))\s+internal storage',
+    r'(\d+(?:GB|TB))\s+of storage',
+    r'with\s+(\d+(?:GB|TB))\s+SSD',
+    r'includes\s+(\d+(?:GB|TB))',
+    r'featuring\s+(\d+(?:GB|TB))',
+    r'(\d+(?:GB|TB))\s*-\s*',
+    r'-\s*(\d+(?:GB|TB))',
+    r'Capacity[:\s]*(\d+(?:GB|TB))',
+    r'Flash Storage[:\s]*(\d+(?:GB|TB))'
+]]
+
+MEMORY_PATTERNS = [re.compile(p, re.IGNORECASE) for p in [
+    r'(\d+GB)\s+unified memory',
+    r'(\d+GB)\s+memory',
+    r'Memory[:\s]+(\d+GB)',
+    r'with\s+(\d+GB)\s+of\s+unified\s+memory',
+    r'(\d+GB)\s+RAM',
+    r'Unified Memory[:\s]*(\d+GB)'
+]]
+
+CHIP_PATTERNS = [re.compile(p, re.IGNORECASE) for p in [
+    r'Apple (M\d+(?:\s+Pro|\s+Max|\s+Ultra)?)',
+    r'(M\d+(?:\s+Pro|\s+Max|\s+Ultra)?)\s+[Cc]hip',
+    r'Apple (M\d+)'
+]]
+
+CPU_CORES_PATTERN = re.compile(r'(\d+)[\-‑]Core CPU', re.IGNORECASE)
+GPU_CORES_PATTERN = re.compile(r'(\d+)[\-‑]Core GPU', re.IGNORECASE)
+
+# Every storage and memory pattern captures one of these; pages without any skip both loops
+SIZE_TOKEN_PATTERN = re.compile(r'\d+(?:GB|TB)', re.IGNORECASE)
+
+# Size/unit parsing of storage and memory candidates
+SPEC_NUMBER_PATTERN = re.compile(r'\d+')
+STORAGE_UNIT_PATTERN = re.compile(r'[GT]B')
+
+DISPLAY_PATTERNS = [re.compile(p, re.IGNORECASE) for p in [
+    r'(\d+(?:\.\d+)?[\-‑]inch)',
+    r'(\d+(?:\.\d+)?")',
+    r'(\d+(?:\.\d+)?)\s*inch'
+]]
+
+# Colour vocabulary in priority order. Each colour gets its own group so the winning
+# pattern is m.lastindex; the lookahead lets overlapping colours (e.g. "Rose Gold" / "Gold")
+# all be seen in a single pass.
+COLOR_NAMES = [
+    'Space (?:Grey|Gray|Black)', 'Silver', 'Gold', 'Rose Gold', 'Midnight', 'Starlight', 'Blue',
+    'Green', 'Pink', 'Purple', 'Yellow', 'Orange', 'Red', 'Sky Blue'
+]
+COLOR_PATTERN = re.compile(r'(?=[\-\s](?:' + '|'.join(f'({c})' for c in COLOR_NAMES) + '))', re.IGNORECASE)
+
+# Price text cleanup and parsing for extract_prices_from_text
+HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+PRICE_PATTERN = re.compile(r'£([\d,]+\.?\d*)')
+
+
+def search_spec_text(pattern, product_name: str, page_text: str):
+    """Search the product name, then the page text, without joining them into one string."""
+    return pattern.search(product_name) or pattern.search(page_text)
+
+
+def find_anchor_attributes(content: bytes, encoding: Optional[str] = None) -> List[tuple]:
+    """(href, aria-label) for every <a> tag with an href, in document order (label may be None)."""
+    anchors = []
+    for tag in ANCHOR_TAG_PATTERN.findall(content):
+        attrs = {}
+        for name, double_quoted, single_quoted, unquoted in ANCHOR_ATTR_PATTERN.findall(tag):
+            value = double_quoted or single_quoted or unquoted
+            attrs.setdefault(name.lower().decode(), html.unescape(value.decode(encoding or 'utf-8', 'replace')))
+        if 'href' in attrs:
+            anchors.append((attrs['href'], attrs.get('aria-label')))
+    return anchors
+
+
+def parse_specs(page_text: str, product_name: str) -> Dict:
+    """Spec fields for one product from its page text and name (no I/O, safe to run in a worker process)."""
+    # Initialize spec fields
+    specs = dict.fromkeys(SPEC_FIELDS)
+    
+    has_sizes = search_spec_text(SIZE_TOKEN_PATTERN, product_name, page_text) is not None
+    
+    # IMPROVED STORAGE EXTRACTION
+    for pattern in STORAGE_PATTERNS if has_sizes else ():
+        storage_match = search_spec_text(pattern, product_name, page_text)
+        if storage_match:
+            storage_candidate = storage_match.group(1)
+            storage_num = int(SPEC_NUMBER_PATTERN.search(storage_candidate).group())
+            storage_unit = STORAGE_UNIT_PATTERN.search(storage_candidate).group()
+            
+            if (storage_unit == 'GB' and storage_num >= 256) or (storage_unit == 'TB' and storage_num <= 8):
+                specs['storage'] = storage_candidate
+                break
+    
+    # IMPROVED MEMORY EXTRACTION
+    for pattern in MEMORY_PATTERNS if has_sizes else ():
+        memory_match = search_spec_text(pattern, product_name, page_text)
+        if memory_match:
+            memory_candidate = memory_match.group(1)
+            memory_num = int(SPEC_NUMBER_PATTERN.search(memory_candidate).group())
+            if 8 <= memory_num <= 128:
+                specs['memory'] = memory_candidate
+                break
+    
+    # CHIP EXTRACTION
+    for pattern in CHIP_PATTERNS:
+        chip_match = search_spec_text(pattern, product_name, page_text)
+        if chip_match:
+            specs['chip'] = chip_match.group(1)
+            break
+    
+    # CPU/GPU CORES EXTRACTION
+    cpu_match = search_spec_text(CPU_CORES_PATTERN, product_name, page_text)
+    if cpu_match:
+        specs['cpu_cores'] = f"{cpu_match.group(1)}-Core CPU"
+    
+    gpu_match = search_spec_text(GPU_CORES_PATTERN, product_name, page_text)
+    if gpu_match:
+        specs['gpu_cores'] = f"{gpu_match.group(1)}-Core GPU"
+    
+    # DISPLAY SIZE EXTRACTION
+    for pattern in DISPLAY_PATTERNS:
+        display_match = pattern.search(product_name)
+        if display_match:
+            size = display_match.group(1)
+            if 'inch' not in size:
+                specs['display_size'] = f"{size}-inch"
+            else:
+                specs['display_size'] = size
+            break
+    
+    # COLOR EXTRACTION - single pass, lowest COLOR_NAMES index wins
+    color_match = None
+    for match in COLOR_PATTERN.finditer(product_name):
+        if color_match is None or match.lastindex < color_match.lastindex:
+            color_match = match
+    if color_match:
+        specs['color'] = color_match.group(color_match.lastindex).strip()
+    
+    # CONNECTIVITY EXTRACTION
+    if 'Gigabit Ethernet' in product_name or 'Gigabit Ethernet' in page_text:
+        specs['connectivity'] = 'Gigabit Ethernet'
+    elif '10Gb Ethernet' in product_name or '10Gb Ethernet' in page_text:
+        specs['connectivity'] = '10Gb Ethernet'
+    elif 'Wi-Fi' in product_name or 'Wi-Fi' in page_text:
+        specs['connectivity'] = 'Wi-Fi'
+    
+    return specs
+
+
+class TokenBucket:
+    """Thread-safe token bucket: allows short bursts up to capacity, then rate requests per second."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
 
 class AppleMacScraperV6:
     def __init__(self):
@@ -58,6 +297,15 @@ class AppleMacScraperV6:
             'Sec-Fetch-Site': 'same-origin',
             'Cache-Control': 'max-age=0',
         })
+        # Every request goes to www.apple.com: one pool, sized so each worker keeps its own
+        # keep-alive connection and pays the TLS handshake once
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=PRODUCT_PAGE_WORKERS))
+        self.rate_limiter = TokenBucket(REQUESTS_PER_SECOND, PRODUCT_PAGE_WORKERS)
+        # URLs requested this run; prune_page_cache() keeps only their cache entries
+        self.fetched_urls = set()
+        
+        # One timestamp for every product in a run (refreshed when scrape_all_mac_products starts)
+        self.scraped_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
         # Initialize Google Sheets client
         self.google_client = None
@@ -83,47 +331,144 @@ class AppleMacScraperV6:
             print(f"❌ Failed to set up Google Sheets: {e}")
             return False
 
-    def get_page(self, url: str, retries: int = 3) -> Optional[BeautifulSoup]:
-        """Fetch and parse a webpage with retries."""
+    def page_cache_paths(self, url: str) -> tuple:
+        """Paths of the cached body and its validator metadata for a URL."""
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(PAGE_CACHE_DIR, f"{key}.html.gz"), os.path.join(PAGE_CACHE_DIR, f"{key}.json")
+
+    def load_cached_page(self, url: str) -> Optional[tuple]:
+        """Return (metadata, body) for a cached page, or None."""
+        if not PAGE_CACHE_DIR:
+            return None
+        body_path, meta_path = self.page_cache_paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with gzip.open(body_path, 'rb') as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None
+
+    def save_cached_page(self, url: str, response: requests.Response, encoding: Optional[str]):
+        """Store a page body and its encoding with its ETag / Last-Modified, when the server sent either."""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not PAGE_CACHE_DIR or not (etag or last_modified):
+            return
+        body_path, meta_path = self.page_cache_paths(url)
+        try:
+            os.makedirs(PAGE_CACHE_DIR, exist_ok=True)
+            with gzip.open(body_path, 'wb') as f:
+                f.write(response.content)
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump({'etag': etag, 'last_modified': last_modified, 'encoding': encoding}, f)
+        except OSError as e:
+            print(f"⚠️ Could not cache {url}: {e}")
+
+    def prune_page_cache(self, keep_urls: Set[str]):
+        """Delete cached pages for every URL not in keep_urls."""
+        if not PAGE_CACHE_DIR or not os.path.isdir(PAGE_CACHE_DIR):
+            return
+        
+        keep_paths = {path for url in keep_urls for path in self.page_cache_paths(url)}
+        removed = 0
+        for name in os.listdir(PAGE_CACHE_DIR):
+            path = os.path.join(PAGE_CACHE_DIR, name)
+            if path not in keep_paths:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError as e:
+                    print(f"⚠️ Could not remove {path}: {e}")
+        if removed:
+            print(f"🗑️ Pruned {removed} cached page files not seen this run")
+
+    def fetch(self, url: str, retries: int = 3) -> Optional[tuple]:
+        """Fetch a webpage with retries, revalidating any cached copy instead of re-downloading it.
+        
+        Returns (content, encoding) - encoding is None when the server declared no charset.
+        """
+        self.fetched_urls.add(url)
+        cached = self.load_cached_page(url)
+        headers = {}
+        if cached:
+            meta = cached[0]
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        
         for attempt in range(retries):
             try:
-                response = self.session.get(url, timeout=30)
+                self.rate_limiter.acquire()
+                response = self.session.get(url, timeout=30, headers=headers)
                 response.raise_for_status()
-                return BeautifulSoup(response.content, 'lxml')
+                if response.status_code == 304 and cached:
+                    # Not modified: serve the stored body
+                    meta, body = cached
+                    return body, meta.get('encoding')
+                # requests reports ISO-8859-1 for text/html without a charset; drop that so
+                # the parsers fall back to the page's <meta charset> instead
+                declared = 'charset' in response.headers.get('content-type', '').lower()
+                encoding = response.encoding if declared else None
+                self.save_cached_page(url, response, encoding)
+                return response.content, encoding
             except requests.RequestException as e:
                 print(f"❌ Attempt {attempt + 1} failed: {e}")
                 if attempt < retries - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
+                    # Honour Retry-After on 429s, otherwise exponential backoff
+                    retry_after = e.response.headers.get('Retry-After', '') if e.response is not None else ''
+                    time.sleep(int(retry_after) if retry_after.isdigit() else 2 ** attempt)
                 else:
                     print(f"❌ Failed to fetch {url} after {retries} attempts")
                     return None
 
+    def get_page(self, url: str, retries: int = 3, parse_only: Optional[SoupStrainer] = None) -> Optional[BeautifulSoup]:
+        """Fetch and parse a webpage with retries (only the parse_only part, when given)."""
+        page = self.fetch(url, retries)
+        if page is None:
+            return None
+        content, encoding = page
+        # Use the declared charset (None when undeclared) so bs4 skips its slow encoding detection
+        return BeautifulSoup(content, 'lxml', from_encoding=encoding, parse_only=parse_only)
+
+    def parse_document(self, content: bytes, encoding: Optional[str]) -> lxml_html.HtmlElement:
+        """Parse a fetched webpage with lxml, without building a BeautifulSoup tree."""
+        parser = lxml_html.HTMLParser(encoding=encoding)
+        return lxml_html.fromstring(content, parser=parser)
+
     def discover_all_pages(self) -> List[str]:
         """Discover all pagination URLs for Mac refurbished products."""
         print("🔍 Discovering all Mac refurbished pages...")
         
-        # Start with the main page
-        soup = self.get_page(self.mac_url)
-        if not soup:
+        # Start with the main page (links are read from the raw bytes, no DOM is built)
+        page = self.fetch(self.mac_url)
+        if page is None:
             return [self.mac_url]
+        content, encoding = page
         
         page_urls = [self.mac_url]
+        anchors = find_anchor_attributes(content, encoding)
         
-        # Look for pagination links
-        pagination_selectors = [
-            'a[href*="mac"][href*="page"]',
-            '.pagination a',
-            'a[href*="?page="]',
-            'a[aria-label*="page"]',
-            'a[href*="fnode"]'
+        # Only '.pagination a' needs the tree, so only parse when the page has such a container
+        pagination_hrefs = []
+        if b'pagination' in content:
+            soup = BeautifulSoup(content, 'lxml', from_encoding=encoding)
+            pagination_hrefs = [link.get('href') for link in soup.select('.pagination a')]
+        
+        # Look for pagination links (same selectors as before, in the same order)
+        pagination_candidates = [
+            [href for href, label in anchors if 'mac' in href and 'page' in href],
+            pagination_hrefs,
+            [href for href, label in anchors if '?page=' in href],
+            [href for href, label in anchors if label and 'page' in label],
+            [href for href, label in anchors if 'fnode' in href]
         ]
         
         found_pages = set([self.mac_url])
         
-        for selector in pagination_selectors:
-            pagination_links = soup.select(selector)
-            for link in pagination_links:
-                href = link.get('href')
+        for hrefs in pagination_candidates:
+            for href in hrefs:
                 if href and '/mac' in href:
                     full_url = urljoin(self.base_url, href)
                     if full_url not in found_pages:
@@ -140,18 +485,77 @@ class AppleMacScraperV6:
                 ]
                 
                 for test_url in test_urls:
-                    test_soup = self.get_page(test_url)
-                    if test_soup:
-                        product_links = test_soup.find_all('a', href=re.compile(r'/uk/shop/product/'))
+                    test_page = self.fetch(test_url)
+                    if test_page is not None:
+                        test_anchors = find_anchor_attributes(*test_page)
+                        product_links = [href for href, label in test_anchors if PRODUCT_HREF in href]
                         if len(product_links) > 10:
                             page_urls.append(test_url)
                             break
-                    time.sleep(1)
         
         print(f"📄 Found {len(page_urls)} pages to scrape")
         return page_urls
 
-    def extract_products_with_prices_from_category_page(self, soup: BeautifulSoup) -> List[Dict]:
+    def extract_products_from_catalog_json(self, content: bytes) -> List[Dict]:
+        """Read products and prices from the REFURB_GRID_BOOTSTRAP JSON embedded in a category page.
+        
+        Returns an empty list when the page has no usable catalog, so the HTML parsers can take over.
+        """
+        start = content.find(CATALOG_JSON_MARKER)
+        if start == -1:
+            return []
+        
+        try:
+            catalog_text = content[start + len(CATALOG_JSON_MARKER):].decode('utf-8').lstrip()
+            catalog, _ = json.JSONDecoder().raw_decode(catalog_text)
+            tiles = catalog['tiles']
+        except (UnicodeDecodeError, ValueError, KeyError, TypeError) as e:
+            print(f"⚠️ Could not read catalog JSON: {e}")
+            return []
+        
+        print(f"🧾 Found {len(tiles)} products in the page's catalog JSON")
+        
+        products = []
+        for i, tile in enumerate(tiles):
+            try:
+                product_url = urljoin(self.base_url, tile['productDetailsUrl'])
+                product_name = tile['title'].strip()
+                
+                # Extract model/SKU from URL
+                url_parts = urlparse(product_url).path.split('/')
+                model_sku = url_parts[4] if len(url_parts) > 4 else None
+                
+                price = tile.get('price') or {}
+                prices = {'current_price': None, 'original_price': None, 'savings': None, 'discount_percentage': None}
+                raw_amount = (price.get('currentPrice') or {}).get('raw_amount')
+                if raw_amount:
+                    prices['current_price'] = float(raw_amount)
+                    original = price.get('originalProductAmount')
+                    if original and original > prices['current_price']:
+                        prices['original_price'] = float(original)
+                        prices['savings'] = prices['original_price'] - prices['current_price']
+                        prices['discount_percentage'] = round((prices['savings'] / prices['original_price'] * 100), 2)
+                
+                print(f"   📱 [{i+1}] {product_name[:50]}... | Price: £{prices.get('current_price', 'N/A')}")
+                
+                products.append({
+                    'name': product_name,
+                    'current_price': prices['current_price'],
+                    'original_price': prices['original_price'],
+                    'savings': prices['savings'],
+                    'discount_percentage': prices['discount_percentage'],
+                    'url': product_url,
+                    'model_sku': model_sku,
+                    'scraped_at': self.scraped_at
+                })
+                
+            except (KeyError, TypeError, ValueError, AttributeError) as e:
+                print(f"❌ Error processing catalog entry {i+1}: {e}")
+                continue
+        
+        return products
+
+    def extract_products_with_prices_from_category_page(self, doc: lxml_html.HtmlElement) -> List[Dict]:
         """
         FIXED APPROACH: Parse Apple's actual text-based product listing format.
         Apple's refurb pages show products as text patterns, not HTML containers.
@@ -159,36 +563,19 @@ class AppleMacScraperV6:
         products = []
         
         # Get the raw page text which contains the product listings
-        page_text = soup.get_text()
+        page_text = ''.join(doc.xpath(PAGE_TEXT_XPATH))
         
-        # Split by '[' and parse each section that contains product info
-        sections = page_text.split('[')
-        sections = [s for s in sections if s and '](' in s]  # Only sections with product links
+        # One regex pass finds every "[Product Name](URL)Price Text" section
+        sections = PRODUCT_LISTING_PATTERN.findall(page_text)
         
         print(f"🔍 Found {len(sections)} potential product sections")
         
-        for i, section in enumerate(sections):
+        for i, (product_name, relative_url, price_text) in enumerate(sections):
             try:
-                # Parse the section: "Product Name](URL)Price Text - "
-                name_end = section.find('](')
-                if name_end == -1:
-                    continue
-                
-                url_start = name_end + 2
-                url_end = section.find(')', url_start)
-                if url_end == -1:
-                    continue
-                
-                # Extract components
-                product_name = section[:name_end].strip()
-                relative_url = section[url_start:url_end].strip()
-                
-                # Get the price text - only the text immediately after the URL until the next product or end
-                price_section_end = section.find(' -', url_end)  # Look for the separator
-                if price_section_end == -1:
-                    price_section_end = len(section)
-                
-                price_text = section[url_end + 1:price_section_end].strip()
+                # Extract components (price text runs until the ' -' separator or the next product)
+                product_name = product_name.strip()
+                relative_url = relative_url.strip()
+                price_text = price_text.strip()
                 
                 # Debug output for the first few products
                 if i < 3:
@@ -222,7 +609,7 @@ class AppleMacScraperV6:
                     'discount_percentage': prices.get('discount_percentage'),
                     'url': product_url,
                     'model_sku': model_sku,
-                    'scraped_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    'scraped_at': self.scraped_at
                 }
                 
                 products.append(product)
@@ -234,12 +621,12 @@ class AppleMacScraperV6:
         # If no products found with the text parsing, try the original link-based approach as fallback
         if not products:
             print("🔄 Text parsing failed, trying fallback link extraction...")
-            return self.extract_products_fallback_method(soup)
+            return self.extract_products_fallback_method(doc)
         
         return products
 
     def extract_prices_from_text(self, price_text: str) -> Dict:
-        """Extract pricing information from Apple's text format with better debugging."""
+        """Extract pricing information from Apple's text format."""
         prices = {
             'current_price': None,
             'original_price': None,
@@ -247,38 +634,27 @@ class AppleMacScraperV6:
             'discount_percentage': None
         }
         
-        if not price_text or len(price_text.strip()) == 0:
+        # No pound sign means no prices; skip the cleanup passes entirely
+        if not price_text or '£' not in price_text:
             return prices
         
         try:
-            # Clean up the text - remove HTML tags and extra whitespace
-            original_text = price_text
-            price_text = re.sub(r'<[^>]+>', '', price_text)  # Remove HTML tags
-            price_text = re.sub(r'\s+', ' ', price_text)  # Normalize whitespace
-            
-            # Remove words but keep the structure
-            clean_text = price_text.replace('Now', '').replace('Was', '').replace('Save', '').replace('visuallyhidden', '')
+            # Only tags can hide a price (e.g. "£<span>1,699</span>"); words and spacing around
+            # the pound sign don't affect the match, so no other cleanup is needed
+            if '<' in price_text:
+                price_text = HTML_TAG_PATTERN.sub('', price_text)
             
-            # Extract all prices from this specific text only
-            price_matches = re.findall(r'£([\d,]+\.?\d*)', clean_text)
-            
-            if not price_matches:
-                return prices
-            
-            # Convert to numbers
+            # One scan, keeping the first three reasonable Mac prices (all the patterns below use)
             price_values = []
-            for match in price_matches:
+            for match in PRICE_PATTERN.finditer(price_text):
                 try:
-                    value = float(match.replace(',', ''))
-                    # Only accept reasonable Mac prices
-                    if 300 <= value <= 15000:
-                        price_values.append(value)
-                except:
+                    value = float(match.group(1).replace(',', ''))
+                except ValueError:
                     continue
-            
-            # Debug output for troubleshooting
-            if len(price_values) > 0:
-                print(f"    💰 Price extraction: '{original_text.strip()[:60]}...' -> Found: {price_values}")
+                if 300 <= value <= 15000:
+                    price_values.append(value)
+                    if len(price_values) == 3:
+                        break
             
             # Pattern 1: Three prices (current, original, savings)
             if len(price_values) >= 3:
@@ -327,18 +703,21 @@ class AppleMacScraperV6:
         
         return prices
 
-    def extract_products_fallback_method(self, soup: BeautifulSoup) -> List[Dict]:
+    def extract_products_fallback_method(self, doc: lxml_html.HtmlElement) -> List[Dict]:
         """Fallback method using the original approach."""
         products = []
         
         # Look for product links directly
-        product_links = soup.find_all('a', href=re.compile(r'/uk/shop/product/'))
+        product_links = doc.xpath(PRODUCT_LINK_XPATH)
         print(f"🔄 Fallback: Found {len(product_links)} product links")
         
+        # Several links can share a container, so each container's text is built once
+        container_texts = {}
+        
         for i, link in enumerate(product_links):
             try:
                 product_url = urljoin(self.base_url, link.get('href', ''))
-                product_name = link.get_text(strip=True)
+                product_name = ''.join(text.strip() for text in link.itertext())
                 
                 # Skip if product name is too short
                 if len(product_name) < 20:
@@ -349,9 +728,12 @@ class AppleMacScraperV6:
                 model_sku = url_parts[4] if len(url_parts) > 4 else None
                 
                 # Try to find pricing near this link
-                parent_container = link.find_parent(['div', 'section', 'article'])
-                if parent_container:
-                    container_text = parent_container.get_text()
+                parent_containers = link.xpath(PRODUCT_CONTAINER_XPATH)
+                if parent_containers:
+                    container = parent_containers[0]
+                    container_text = container_texts.get(container)
+                    if container_text is None:
+                        container_text = container_texts[container] = container.text_content()
                     prices = self.extract_prices_from_text(container_text)
                 else:
                     prices = {'current_price': None, 'original_price': None, 'savings': None, 'discount_percentage': None}
@@ -366,7 +748,7 @@ class AppleMacScraperV6:
                     'discount_percentage': prices.get('discount_percentage'),
                     'url': product_url,
                     'model_sku': model_sku,
-                    'scraped_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    'scraped_at': self.scraped_at
                 }
                 
                 products.append(product)
@@ -377,146 +759,37 @@ class AppleMacScraperV6:
         
         return products
 
-    def extract_detailed_specs(self, product: Dict) -> Dict:
-        """Extract detailed specifications from individual product pages."""
+    def get_product_page_text(self, url: str) -> Optional[str]:
+        """Fetch a product page and return its visible text; the soup is dropped straight away."""
+        soup = self.get_page(url, parse_only=PRODUCT_PAGE_STRAINER)
+        if not soup:
+            return None
+        return soup.get_text()
+
+    def extract_detailed_specs(self, product: Dict, page_text: Optional[str] = None,
+                               specs_future: Optional[Future] = None) -> Dict:
+        """Extract detailed specifications from individual product pages.
+        
+        Pass page_text when the product page has already been fetched (otherwise it is fetched
+        here), and specs_future when parse_specs is already running on it in a worker process.
+        """
         product_url = product.get('url')
         if not product_url:
             return product
         
         print(f"🔍 Getting detailed specs for: {product.get('name', 'Unknown')[:50]}...")
         
-        soup = self.get_page(product_url)
-        if not soup:
+        if page_text is None:
+            page_text = self.get_product_page_text(product_url)
+        if page_text is None:
             print(f"❌ Could not fetch product page")
             return product
         
         try:
-            # Initialize spec fields
-            specs = {
-                'memory': None,
-                'storage': None,
-                'chip': None,
-                'display_size': None,
-                'color': None,
-                'connectivity': None,
-                'cpu_cores': None,
-                'gpu_cores': None
-            }
-            
-            # Get all page text for analysis
-            page_text = soup.get_text()
-            product_name = product.get('name', '')
-            
-            # IMPROVED STORAGE EXTRACTION
-            storage_patterns = [
-                r'(\d+(?:GB|TB))\s+SSD',
-                r'(\d+(?:GB|TB))\s+storage',
-                r'Storage[:\s]+(\d+(?:GB|TB))',
-                r'(\d+(?:GB|TB))\s+internal storage',
-                r'(\d+(?:GB|TB))\s+of storage',
-                r'with\s+(\d+(?:GB|TB))\s+SSD',
-                r'includes\s+(\d+(?:GB|TB))',
-                r'featuring\s+(\d+(?:GB|TB))',
-                r'(\d+(?:GB|TB))\s*-\s*',
-                r'-\s*(\d+(?:GB|TB))',
-                r'Capacity[:\s]*(\d+(?:GB|TB))',
-                r'Flash Storage[:\s]*(\d+(?:GB|TB))'
-            ]
-            
-            combined_text = f"{product_name} {page_text}"
-            
-            for pattern in storage_patterns:
-                storage_match = re.search(pattern, combined_text, re.IGNORECASE)
-                if storage_match:
-                    storage_candidate = storage_match.group(1)
-                    storage_num = int(re.search(r'\d+', storage_candidate).group())
-                    storage_unit = re.search(r'[GT]B', storage_candidate).group()
-                    
-                    if (storage_unit == 'GB' and storage_num >= 256) or (storage_unit == 'TB' and storage_num <= 8):
-                        specs['storage'] = storage_candidate
-                        break
-            
-            # IMPROVED MEMORY EXTRACTION
-            memory_patterns = [
-                r'(\d+GB)\s+unified memory',
-                r'(\d+GB)\s+memory',
-                r'Memory[:\s]+(\d+GB)',
-                r'with\s+(\d+GB)\s+of\s+unified\s+memory',
-                r'(\d+GB)\s+RAM',
-                r'Unified Memory[:\s]*(\d+GB)'
-            ]
-            
-            for pattern in memory_patterns:
-                memory_match = re.search(pattern, combined_text, re.IGNORECASE)
-                if memory_match:
-                    memory_candidate = memory_match.group(1)
-                    memory_num = int(re.search(r'\d+', memory_candidate).group())
-                    if 8 <= memory_num <= 128:
-                        specs['memory'] = memory_candidate
-                        break
-            
-            # CHIP EXTRACTION
-            chip_patterns = [
-                r'Apple (M\d+(?:\s+Pro|\s+Max|\s+Ultra)?)',
-                r'(M\d+(?:\s+Pro|\s+Max|\s+Ultra)?)\s+[Cc]hip',
-                r'Apple (M\d+)'
-            ]
-            
-            for pattern in chip_patterns:
-                chip_match = re.search(pattern, combined_text, re.IGNORECASE)
-                if chip_match:
-                    specs['chip'] = chip_match.group(1)
-                    break
-            
-            # CPU/GPU CORES EXTRACTION
-            cpu_match = re.search(r'(\d+)[\-‑]Core CPU', combined_text, re.IGNORECASE)
-            if cpu_match:
-                specs['cpu_cores'] = f"{cpu_match.group(1)}-Core CPU"
-            
-            gpu_match = re.search(r'(\d+)[\-‑]Core GPU', combined_text, re.IGNORECASE)
-            if gpu_match:
-                specs['gpu_cores'] = f"{gpu_match.group(1)}-Core GPU"
-            
-            # DISPLAY SIZE EXTRACTION
-            display_patterns = [
-                r'(\d+(?:\.\d+)?[\-‑]inch)',
-                r'(\d+(?:\.\d+)?")',
-                r'(\d+(?:\.\d+)?)\s*inch'
-            ]
-            
-            for pattern in display_patterns:
-                display_match = re.search(pattern, product_name, re.IGNORECASE)
-                if display_match:
-                    size = display_match.group(1)
-                    if 'inch' not in size:
-                        specs['display_size'] = f"{size}-inch"
-                    else:
-                        specs['display_size'] = size
-                    break
-            
-            # COLOR EXTRACTION
-            color_patterns = [
-                r'[\-\s](Space (?:Grey|Gray|Black))',
-                r'[\-\s](Silver)', r'[\-\s](Gold)', r'[\-\s](Rose Gold)',
-                r'[\-\s](Midnight)', r'[\-\s](Starlight)', r'[\-\s](Blue)',
-                r'[\-\s](Green)', r'[\-\s](Pink)', r'[\-\s](Purple)',
-                r'[\-\s](Yellow)', r'[\-\s](Orange)', r'[\-\s](Red)',
-                r'[\-\s](Sky Blue)'
-            ]
-            
-            for pattern in color_patterns:
-                color_match = re.search(pattern, product_name, re.IGNORECASE)
-                if color_match:
-                    specs['color'] = color_match.group(1).strip()
-                    break
-            
-            # CONNECTIVITY EXTRACTION
-            if 'Gigabit Ethernet' in combined_text:
-                specs['connectivity'] = 'Gigabit Ethernet'
-            elif '10Gb Ethernet' in combined_text:
-                specs['connectivity'] = '10Gb Ethernet'
-            elif 'Wi-Fi' in combined_text:
-                specs['connectivity'] = 'Wi-Fi'
+            if specs_future is not None:
+                specs = specs_future.result()
+            else:
+                specs = parse_specs(page_text, product.get('name', ''))
             
             # Add specs to product
             product.update(specs)
@@ -528,6 +801,25 @@ class AppleMacScraperV6:
         
         return product
 
+    def load_existing_specs(self) -> Dict[str, Dict]:
+        """Spec fields already in the Google Sheet, keyed by product URL (rows with no specs are left out)."""
+        if not self.google_client:
+            return {}
+        
+        try:
+            sheet = self.google_client.open_by_key(GOOGLE_SHEET_ID).sheet1
+            records = sheet.get_all_records(numericise_ignore=['all'])
+        except Exception as e:
+            print(f"⚠️ Could not read existing sheet, fetching every product page: {e}")
+            return {}
+        
+        existing_specs = {}
+        for record in records:
+            specs = {field: record.get(field) or None for field in SPEC_FIELDS}
+            if record.get('url') and any(specs.values()):
+                existing_specs[record['url']] = specs
+        return existing_specs
+
     def scrape_all_mac_products(self) -> List[Dict]:
         """
         MAIN SCRAPING METHOD - FIXED APPROACH
@@ -538,6 +830,8 @@ class AppleMacScraperV6:
         print("🍎 Apple Mac Scraper V6 - FIXED PRICING ISSUE")
         print("=" * 60)
         
+        self.scraped_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
         # Discover all pages
         page_urls = self.discover_all_pages()
         
@@ -552,12 +846,16 @@ class AppleMacScraperV6:
             print(f"\n📄 SCRAPING PAGE {page_num}/{len(page_urls)}")
             print(f"🔗 URL: {page_url}")
             
-            soup = self.get_page(page_url)
-            if not soup:
+            page = self.fetch(page_url)
+            if page is None:
                 continue
+            content, encoding = page
             
-            # Extract products with pricing from category page
-            page_products = self.extract_products_with_prices_from_category_page(soup)
+            # Extract products with pricing from the page's catalog JSON, or from the listing HTML
+            page_products = self.extract_products_from_catalog_json(content)
+            if not page_products:
+                doc = self.parse_document(content, encoding)
+                page_products = self.extract_products_with_prices_from_category_page(doc)
             
             # Filter out duplicates
             new_products = []
@@ -568,9 +866,6 @@ class AppleMacScraperV6:
             
             print(f"📦 Found {len(new_products)} new products with pricing on this page")
             all_products.extend(new_products)
-            
-            # Be respectful between pages
-            time.sleep(2)
         
         print(f"\n🎯 TOTAL PRODUCTS WITH PRICING: {len(all_products)}")
         products_with_prices = len([p for p in all_products if p.get('current_price')])
@@ -580,18 +875,48 @@ class AppleMacScraperV6:
         print(f"\n🔍 STEP 2: EXTRACTING DETAILED SPECS FROM PRODUCT PAGES")
         print("=" * 60)
         
-        detailed_products = []
-        for i, product in enumerate(all_products, 1):
-            print(f"\n📱 [{i}/{len(all_products)}] Processing: {product.get('name', 'Unknown')[:50]}...")
+        # Products already in the sheet keep their specs; only new product pages are fetched.
+        # Prices always come from this run's category pages, and the upload rewrites every row
+        existing_specs = self.load_existing_specs()
+        new_products = []
+        for product in all_products:
+            specs = existing_specs.get(product['url'])
+            if specs:
+                product.update(specs)
+            else:
+                new_products.append(product)
+        
+        if existing_specs:
+            print(f"♻️ Reusing specs for {len(all_products) - len(new_products)} products already in the sheet")
+        
+        # Product pages are fetched by a small worker pool and handed over in order. Workers
+        # return only the page text, so parsed trees never pile up waiting to be processed.
+        # Each page's spec regexes run in a separate process as soon as its text arrives
+        with ThreadPoolExecutor(max_workers=PRODUCT_PAGE_WORKERS) as fetch_executor, \
+                ProcessPoolExecutor(max_workers=SPEC_PROCESS_WORKERS, mp_context=SPEC_PROCESS_CONTEXT) as spec_executor:
+            product_urls = [product.get('url') for product in new_products]
+            page_texts = fetch_executor.map(lambda url: self.get_product_page_text(url) if url else None, product_urls)
             
-            # Extract detailed specs (pricing already done)
-            detailed_product = self.extract_detailed_specs(product)
-            detailed_products.append(detailed_product)
+            pending_specs = []
+            for product, page_text in zip(new_products, page_texts):
+                if page_text is None:
+                    pending_specs.append((None, None))
+                else:
+                    specs_future = spec_executor.submit(parse_specs, page_text, product.get('name', ''))
+                    pending_specs.append((page_text, specs_future))
             
-            # Be respectful between product pages
-            time.sleep(0.5)
+            for i, (product, (page_text, specs_future)) in enumerate(zip(new_products, pending_specs), 1):
+                print(f"\n📱 [{i}/{len(new_products)}] Processing: {product.get('name', 'Unknown')[:50]}...")
+                
+                # Extract detailed specs (pricing already done); updates the product in place
+                self.extract_detailed_specs(product, page_text, specs_future)
         
-        return detailed_products
+        # Drop cached pages for products and listing pages that are gone (skipped when nothing
+        # was scraped, so a failed run doesn't empty the cache)
+        if all_products:
+            self.prune_page_cache(self.fetched_urls | {product['url'] for product in all_products if product.get('url')})
+        
+        return all_products
 
     def save_to_csv(self, products: List[Dict], filename: str = "mac_products_v6_fixed_pricing.csv"):
         """Save products to CSV file."""
@@ -599,23 +924,17 @@ class AppleMacScraperV6:
             print("❌ No products to save")
             return None
         
-        df = pd.DataFrame(products)
-        
-        # Reorder columns for better readability
-        preferred_order = [
-            'name', 'chip', 'cpu_cores', 'gpu_cores', 'memory', 'storage', 
-            'display_size', 'color', 'current_price', 'original_price', 
-            'savings', 'discount_percentage', 'connectivity', 'url', 
-            'model_sku', 'scraped_at'
-        ]
-        
-        # Only include columns that exist
-        existing_columns = [col for col in preferred_order if col in df.columns]
-        remaining_columns = [col for col in df.columns if col not in existing_columns]
+        # Reorder columns for better readability (only columns that exist, in first-seen order)
+        all_columns = dict.fromkeys(key for product in products for key in product)
+        existing_columns = [col for col in PRODUCT_COLUMN_ORDER if col in all_columns]
+        remaining_columns = [col for col in all_columns if col not in existing_columns]
         final_columns = existing_columns + remaining_columns
         
-        df = df[final_columns]
-        df.to_csv(filename, index=False)
+        # Stream rows straight from the dicts (missing keys and None are written as empty cells)
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=final_columns)
+            writer.writeheader()
+            writer.writerows(products)
         print(f"💾 Saved {len(products)} products to {filename}")
         return filename
 
@@ -648,9 +967,6 @@ class AppleMacScraperV6:
                     sheet = spreadsheet.sheet1
                     print(f"✅ Created new sheet: {GOOGLE_SHEET_NAME}")
             
-            # Clear existing data
-            sheet.clear()
-            
             # Prepare data for upload
             if products:
                 # Get all possible headers
@@ -659,14 +975,7 @@ class AppleMacScraperV6:
                     all_headers.update(product.keys())
                 
                 # Order headers logically
-                preferred_order = [
-                    'name', 'chip', 'cpu_cores', 'gpu_cores', 'memory', 'storage',
-                    'display_size', 'color', 'current_price', 'original_price', 
-                    'savings', 'discount_percentage', 'connectivity', 'url', 
-                    'model_sku', 'scraped_at'
-                ]
-                
-                headers = [h for h in preferred_order if h in all_headers]
+                headers = [h for h in PRODUCT_COLUMN_ORDER if h in all_headers]
                 headers.extend([h for h in all_headers if h not in headers])
                 
                 # Prepare data rows
@@ -682,29 +991,34 @@ class AppleMacScraperV6:
                             row.append(str(value))
                     data.append(row)
                 
-                # Upload all data
-                sheet.update(data, value_input_option='USER_ENTERED')
-                
-                # Format the header row
-                sheet.format('A1:Z1', {
+                # Clear cell values over the whole sheet (formatting is kept) and format the header row
+                formats = [('A1:Z1', {
                     'backgroundColor': {'red': 0.2, 'green': 0.2, 'blue': 0.2},
                     'textFormat': {'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}, 'bold': True}
-                })
+                })]
                 
                 # Format price columns as currency
-                try:
-                    price_columns = []
-                    for i, header in enumerate(headers):
-                        if 'price' in header.lower() or 'savings' in header.lower():
-                            price_columns.append(chr(65 + i))
-                    
-                    for col in price_columns:
-                        if ord(col) - 65 < 26:
-                            sheet.format(f'{col}2:{col}1000', {
-                                'numberFormat': {'type': 'CURRENCY', 'pattern': '£#,##0.00'}
-                            })
-                except Exception as e:
-                    print(f"⚠️ Could not format currency columns: {e}")
+                for i, header in enumerate(headers, 1):
+                    if 'price' in header.lower() or 'savings' in header.lower():
+                        formats.append((f'{rowcol_to_a1(2, i)}:{rowcol_to_a1(1000, i)}', {
+                            'numberFormat': {'type': 'CURRENCY', 'pattern': '£#,##0.00'}
+                        }))
+                
+                requests_body = [{
+                    'updateCells': {'range': {'sheetId': sheet.id}, 'fields': 'userEnteredValue'}
+                }]
+                for a1_range, cell_format in formats:
+                    requests_body.append({
+                        'repeatCell': {
+                            'range': a1_range_to_grid_range(a1_range, sheet.id),
+                            'cell': {'userEnteredFormat': cell_format},
+                            'fields': f"userEnteredFormat({','.join(cell_format.keys())})"
+                        }
+                    })
+                
+                # One batch_update for the clear and all formatting, then one write for the values
+                spreadsheet.batch_update({'requests': requests_body})
+                sheet.update(data, value_input_option='USER_ENTERED')
                 
                 print(f"✅ Successfully uploaded to Google Sheets!")
                 print(f"🔗 View your sheet: https://docs.google.com/spreadsheets/d/{sheet.spreadsheet.id}")
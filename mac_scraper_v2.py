@@ -21,13 +21,14 @@ import time
 import os
 from datetime import datetime
 from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from typing import List, Dict, Optional
 import pandas as pd
 
 # Google Sheets integration
 try:
     import gspread
+    from gspread.utils import a1_range_to_grid_range
     from oauth2client.service_account import ServiceAccountCredentials
     GOOGLE_SHEETS_AVAILABLE = True
 except ImportError:
@@ -38,6 +39,27 @@ except ImportError:
 GOOGLE_SHEET_NAME = "Apple Mac Products V2"  # Change this to your Google Sheet name
 CREDENTIALS_FILE = "credentials.json"  # Make sure this file is in the same folder
 
+# The refurb listing is only read for its product containers and their text, so <head>
+# (meta, link and script tags) is never built into the soup
+LISTING_PAGE_STRAINER = SoupStrainer('body')
+
+PRODUCT_HREF_PATTERN = re.compile(r'/uk/shop/product/')
+
+# Container selectors for pages without product links, in priority order (first hit wins)
+CONTAINER_SELECTORS = ['.rf-psp-column', '.tiles-item', '.product-tile']
+
+# Price patterns for extract_product_from_container and extract_clean_price
+PRICE_PATTERN = re.compile(r'£([\d,]+\.?\d*)')
+NOW_PRICE_PATTERN = re.compile(r'Now\s*£([\d,]+\.?\d*)')
+WAS_PRICE_PATTERN = re.compile(r'Was\s*£([\d,]+\.?\d*)')
+SAVE_PRICE_PATTERN = re.compile(r'Save\s*£([\d,]+\.?\d*)')
+
+# Price patterns for find_price_elements
+PRICE_ELEMENT_PATTERNS = [
+    re.compile(r'£[\d,]+\.?\d*'),  # £1,234.56 or £1234
+    re.compile(r'\$[\d,]+\.?\d*')  # Just in case there are dollar prices
+]
+
 
 class AppleMacScraperV2:
     def __init__(self):
@@ -77,36 +99,34 @@ class AppleMacScraperV2:
             print(f"❌ Failed to set up Google Sheets: {e}")
             return False
 
-    def get_page(self, url: str) -> Optional[BeautifulSoup]:
-        """Fetch and parse a webpage."""
+    def get_page(self, url: str, parse_only: Optional[SoupStrainer] = None) -> Optional[BeautifulSoup]:
+        """Fetch and parse a webpage (only the parse_only part, when given)."""
         try:
             print(f"📡 Fetching: {url}")
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
-            return BeautifulSoup(response.content, 'lxml')
+            # A charset declared in Content-Type (UTF-8 for apple.com) skips bs4's encoding
+            # detection pass; without one, requests' ISO-8859-1 default would override <meta charset>
+            declared = 'charset' in response.headers.get('content-type', '').lower()
+            return BeautifulSoup(response.content, 'lxml', from_encoding=response.encoding if declared else None, parse_only=parse_only)
         except requests.RequestException as e:
             print(f"❌ Failed to fetch {url}: {e}")
             return None
 
     def find_price_elements(self, soup: BeautifulSoup) -> List:
         """Find all elements that contain prices."""
-        price_patterns = [
-            r'£[\d,]+\.?\d*',  # £1,234.56 or £1234
-            r'\$[\d,]+\.?\d*'  # Just in case there are dollar prices
-        ]
-        
         price_elements = []
         
         # Search for price patterns in all text
         for element in soup.find_all(text=True):
             text = element.strip()
             if text:
-                for pattern in price_patterns:
-                    if re.search(pattern, text):
+                for pattern in PRICE_ELEMENT_PATTERNS:
+                    if pattern.search(text):
                         price_elements.append({
                             'element': element.parent if hasattr(element, 'parent') else element,
                             'text': text,
-                            'prices': re.findall(pattern, text)
+                            'prices': pattern.findall(text)
                         })
         
         return price_elements
@@ -117,7 +137,7 @@ class AppleMacScraperV2:
             return None
         
         # Remove currency symbol and convert to float
-        price_match = re.search(r'£([\d,]+\.?\d*)', price_text)
+        price_match = PRICE_PATTERN.search(price_text)
         if price_match:
             return float(price_match.group(1).replace(',', ''))
         return None
@@ -126,37 +146,25 @@ class AppleMacScraperV2:
         """Find the main containers that hold product information."""
         print("🔍 Looking for product containers...")
         
-        # Try various container selectors
-        container_selectors = [
-            'div:has(a[href*="/uk/shop/product/"])',  # Divs containing product links
-            'li:has(a[href*="/uk/shop/product/"])',   # List items containing product links
-            'section:has(a[href*="/uk/shop/product/"])', # Sections containing product links
-            '.rf-psp-column',
-            '.tiles-item',
-            '.product-tile'
-        ]
-        
-        containers = []
+        # Each product link's parent is its container; dict keyed by id() dedupes in one pass
+        product_links = soup.find_all('a', href=PRODUCT_HREF_PATTERN)
+        containers = list({id(link.parent): link.parent for link in product_links if link.parent}.values())
+        if containers:
+            print(f"Found {len(containers)} containers from {len(product_links)} product links")
         
-        for selector in container_selectors:
-            try:
-                elements = soup.select(selector)
-                if elements:
-                    print(f"Found {len(elements)} containers with selector: {selector}")
-                    containers.extend(elements)
-                    break  # Use the first selector that finds containers
-            except Exception as e:
-                print(f"Error with selector {selector}: {e}")
-                continue
-        
-        # If no containers found, find parent elements of product links
+        # If no product links found, try the named container selectors
         if not containers:
-            print("🔄 Falling back to finding parent elements of product links...")
-            product_links = soup.find_all('a', href=re.compile(r'/uk/shop/product/'))
-            for link in product_links:
-                parent = link.parent
-                if parent and parent not in containers:
-                    containers.append(parent)
+            print("🔄 Falling back to named container selectors...")
+            for selector in CONTAINER_SELECTORS:
+                try:
+                    elements = soup.select(selector)
+                    if elements:
+                        print(f"Found {len(elements)} containers with selector: {selector}")
+                        containers.extend(elements)
+                        break  # Use the first selector that finds containers
+                except Exception as e:
+                    print(f"Error with selector {selector}: {e}")
+                    continue
         
         print(f"📦 Found {len(containers)} potential product containers")
         return containers
@@ -167,7 +175,7 @@ class AppleMacScraperV2:
             print(f"\n--- Processing Container {index + 1} ---")
             
             # Find product link
-            product_link = container.find('a', href=re.compile(r'/uk/shop/product/'))
+            product_link = container.find('a', href=PRODUCT_HREF_PATTERN)
             if not product_link:
                 print("❌ No product link found in container")
                 return None
@@ -183,7 +191,7 @@ class AppleMacScraperV2:
             print(f"📄 Container text sample: {container_text[:200]}...")
             
             # Extract prices from container text
-            prices = re.findall(r'£([\d,]+\.?\d*)', container_text)
+            prices = PRICE_PATTERN.findall(container_text)
             print(f"💰 Found prices in container: {prices}")
             
             # Look for specific price indicators
@@ -192,19 +200,19 @@ class AppleMacScraperV2:
             savings = None
             
             # Try to find "Now" price (current price)
-            now_match = re.search(r'Now\s*£([\d,]+\.?\d*)', container_text)
+            now_match = NOW_PRICE_PATTERN.search(container_text)
             if now_match:
                 current_price = float(now_match.group(1).replace(',', ''))
                 print(f"✅ Found current price: £{current_price}")
             
             # Try to find "Was" price (original price)
-            was_match = re.search(r'Was\s*£([\d,]+\.?\d*)', container_text)
+            was_match = WAS_PRICE_PATTERN.search(container_text)
             if was_match:
                 original_price = float(was_match.group(1).replace(',', ''))
                 print(f"✅ Found original price: £{original_price}")
             
             # Try to find "Save" amount
-            save_match = re.search(r'Save\s*£([\d,]+\.?\d*)', container_text)
+            save_match = SAVE_PRICE_PATTERN.search(container_text)
             if save_match:
                 savings = float(save_match.group(1).replace(',', ''))
                 print(f"✅ Found savings: £{savings}")
@@ -257,7 +265,7 @@ class AppleMacScraperV2:
         print("=" * 60)
         
         # Get the Mac refurbished page
-        soup = self.get_page(self.mac_url)
+        soup = self.get_page(self.mac_url, parse_only=LISTING_PAGE_STRAINER)
         if not soup:
             return []
         
@@ -310,14 +318,12 @@ class AppleMacScraperV2:
             
             # Try to open existing sheet, create if it doesn't exist
             try:
-                sheet = self.google_client.open(GOOGLE_SHEET_NAME).sheet1
+                spreadsheet = self.google_client.open(GOOGLE_SHEET_NAME)
                 print(f"✅ Opened existing sheet: {GOOGLE_SHEET_NAME}")
             except gspread.SpreadsheetNotFound:
                 print(f"📝 Creating new sheet: {GOOGLE_SHEET_NAME}")
-                sheet = self.google_client.create(GOOGLE_SHEET_NAME).sheet1
-            
-            # Clear existing data
-            sheet.clear()
+                spreadsheet = self.google_client.create(GOOGLE_SHEET_NAME)
+            sheet = spreadsheet.sheet1
             
             # Prepare data for upload
             headers = list(products[0].keys())
@@ -327,14 +333,23 @@ class AppleMacScraperV2:
                 row = [str(product.get(header, '')) for header in headers]
                 data.append(row)
             
-            # Upload all data
-            sheet.update(data, value_input_option='USER_ENTERED')
-            
-            # Format the header row
-            sheet.format('A1:Z1', {
+            # Clear cell values over the whole sheet (formatting is kept) and format the header row
+            header_format = {
                 'backgroundColor': {'red': 0.2, 'green': 0.2, 'blue': 0.2},
                 'textFormat': {'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}, 'bold': True}
-            })
+            }
+            requests_body = [
+                {'updateCells': {'range': {'sheetId': sheet.id}, 'fields': 'userEnteredValue'}},
+                {'repeatCell': {
+                    'range': a1_range_to_grid_range('A1:Z1', sheet.id),
+                    'cell': {'userEnteredFormat': header_format},
+                    'fields': f"userEnteredFormat({','.join(header_format.keys())})"
+                }}
+            ]
+            
+            # One batch_update for the clear and formatting, then one write for the values
+            spreadsheet.batch_update({'requests': requests_body})
+            sheet.update(data, value_input_option='USER_ENTERED')
             
             print(f"✅ Successfully uploaded to Google Sheets!")
             print(f"🔗 View your sheet: https://docs.google.com/spreadsheets/d/{sheet.spreadsheet.id}")
@@ -19,17 +19,21 @@ Dependencies:
 import requests
 import re
 import json
+import csv
+import sys
 import time
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from urllib.parse import urljoin, urlparse, parse_qs
 from bs4 import BeautifulSoup
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, Iterator, Optional, Set
 import pandas as pd
 
 # Google Sheets integration
 try:
     import gspread
+    from gspread.utils import a1_range_to_grid_range, rowcol_to_a1
     from oauth2client.service_account import ServiceAccountCredentials
     GOOGLE_SHEETS_AVAILABLE = True
 except ImportError:
@@ -40,6 +44,21 @@ except ImportError:
 GOOGLE_SHEET_NAME = "Apple Mac Products V6"  # Updated sheet name
 CREDENTIALS_FILE = "credentials.json"  # Make sure this file is in the same folder
 
+# Column order for the CSV and the sheet (any other keys follow)
+PRODUCT_COLUMN_ORDER = [
+    'name', 'chip', 'cpu_cores', 'gpu_cores', 'memory', 'storage',
+    'display_size', 'color', 'current_price', 'original_price',
+    'savings', 'discount_percentage', 'connectivity', 'url',
+    'model_sku', 'scraped_at'
+]
+
+# print_summary switches from a Python loop to pandas column operations above this many products
+SUMMARY_FRAME_THRESHOLD = 200
+
+# Spec fields reported in the print_summary coverage section
+SUMMARY_SPEC_FIELDS = ('memory', 'storage', 'chip', 'color')
+SUMMARY_SPEC_LABELS = tuple(field.title() for field in SUMMARY_SPEC_FIELDS)
+
 
 class AppleMacScraperV6:
     def __init__(self):
@@ -562,34 +581,45 @@ class AppleMacScraperV6:
         
         return detailed_products
 
-    def save_to_csv(self, products: List[Dict], filename: str = "mac_products_v6_fixed_pricing.csv"):
-        """Save products to CSV file."""
+    def product_headers(self, products: List[Dict]) -> List[str]:
+        """Column headers for the products, in PRODUCT_COLUMN_ORDER and then first-seen order."""
+        all_headers = dict.fromkeys(key for product in products for key in product)
+        headers = [h for h in PRODUCT_COLUMN_ORDER if h in all_headers]
+        headers.extend([h for h in all_headers if h not in headers])
+        return headers
+
+    def iter_product_rows(self, products: List[Dict], headers: List[str]) -> Iterator[List[str]]:
+        """Yield one row of cell strings per product (missing keys and None become empty cells)."""
+        for product in products:
+            values = map(product.get, headers)
+            yield ['' if value is None else str(value) for value in values]
+
+    def build_product_rows(self, products: List[Dict]) -> List[List[str]]:
+        """Header row plus one row of cell strings per product, shared by the CSV and the sheet."""
+        headers = self.product_headers(products)
+        return [headers, *self.iter_product_rows(products, headers)]
+
+    def save_to_csv(self, products: List[Dict], filename: str = "mac_products_v6_fixed_pricing.csv",
+                    rows: Optional[List[List[str]]] = None):
+        """Save products to CSV file (rows from build_product_rows are reused when given)."""
         if not products:
             print("❌ No products to save")
             return None
         
-        df = pd.DataFrame(products)
-        
-        # Reorder columns for better readability
-        preferred_order = [
-            'name', 'chip', 'cpu_cores', 'gpu_cores', 'memory', 'storage', 
-            'display_size', 'color', 'current_price', 'original_price', 
-            'savings', 'discount_percentage', 'connectivity', 'url', 
-            'model_sku', 'scraped_at'
-        ]
-        
-        # Only include columns that exist
-        existing_columns = [col for col in preferred_order if col in df.columns]
-        remaining_columns = [col for col in df.columns if col not in existing_columns]
-        final_columns = existing_columns + remaining_columns
-        
-        df = df[final_columns]
-        df.to_csv(filename, index=False)
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if rows is not None:
+                writer.writerows(rows)
+            else:
+                # CSV-only run: stream the rows instead of materializing them
+                headers = self.product_headers(products)
+                writer.writerow(headers)
+                writer.writerows(self.iter_product_rows(products, headers))
         print(f"💾 Saved {len(products)} products to {filename}")
         return filename
 
-    def upload_to_google_sheets(self, products: List[Dict]) -> bool:
-        """Upload products to Google Sheets."""
+    def upload_to_google_sheets(self, products: List[Dict], rows: Optional[List[List[str]]] = None) -> bool:
+        """Upload products to Google Sheets (rows from build_product_rows are reused when given)."""
         if not self.google_client:
             print("❌ Google Sheets not available")
             return False
@@ -603,7 +633,8 @@ class AppleMacScraperV6:
             
             # Try to open existing sheet, create if it doesn't exist
             try:
-                sheet = self.google_client.open(GOOGLE_SHEET_NAME).sheet1
+                spreadsheet = self.google_client.open(GOOGLE_SHEET_NAME)
+                sheet = spreadsheet.sheet1
                 print(f"✅ Opened existing sheet: {GOOGLE_SHEET_NAME}")
             except:
                 # Create new spreadsheet
@@ -611,63 +642,39 @@ class AppleMacScraperV6:
                 sheet = spreadsheet.sheet1
                 print(f"✅ Created new sheet: {GOOGLE_SHEET_NAME}")
             
-            # Clear existing data
-            sheet.clear()
-            
             # Prepare data for upload
             if products:
-                # Get all possible headers
-                all_headers = set()
-                for product in products:
-                    all_headers.update(product.keys())
-                
-                # Order headers logically
-                preferred_order = [
-                    'name', 'chip', 'cpu_cores', 'gpu_cores', 'memory', 'storage',
-                    'display_size', 'color', 'current_price', 'original_price', 
-                    'savings', 'discount_percentage', 'connectivity', 'url', 
-                    'model_sku', 'scraped_at'
-                ]
-                
-                headers = [h for h in preferred_order if h in all_headers]
-                headers.extend([h for h in all_headers if h not in headers])
-                
-                # Prepare data rows
-                data = [headers]  # Start with headers
-                
-                for product in products:
-                    row = []
-                    for header in headers:
-                        value = product.get(header, '')
-                        if value is None:
-                            row.append('')
-                        else:
-                            row.append(str(value))
-                    data.append(row)
+                data = rows if rows is not None else self.build_product_rows(products)
+                headers = data[0]
                 
-                # Upload all data
-                sheet.update(data, value_input_option='USER_ENTERED')
-                
-                # Format the header row
-                sheet.format('A1:Z1', {
+                # Clear cell values over the whole sheet (formatting is kept) and format the header row
+                formats = [('A1:Z1', {
                     'backgroundColor': {'red': 0.2, 'green': 0.2, 'blue': 0.2},
                     'textFormat': {'foregroundColor': {'red': 1, 'green': 1, 'blue': 1}, 'bold': True}
-                })
+                })]
                 
                 # Format price columns as currency
-                try:
-                    price_columns = []
-                    for i, header in enumerate(headers):
-                        if 'price' in header.lower() or 'savings' in header.lower():
-                            price_columns.append(chr(65 + i))
-                    
-                    for col in price_columns:
-                        if ord(col) - 65 < 26:
-                            sheet.format(f'{col}2:{col}1000', {
-                                'numberFormat': {'type': 'CURRENCY', 'pattern': '£#,##0.00'}
-                            })
-                except Exception as e:
-                    print(f"⚠️ Could not format currency columns: {e}")
+                for i, header in enumerate(headers, 1):
+                    if 'price' in header.lower() or 'savings' in header.lower():
+                        formats.append((f'{rowcol_to_a1(2, i)}:{rowcol_to_a1(1000, i)}', {
+                            'numberFormat': {'type': 'CURRENCY', 'pattern': '£#,##0.00'}
+                        }))
+                
+                requests_body = [{
+                    'updateCells': {'range': {'sheetId': sheet.id}, 'fields': 'userEnteredValue'}
+                }]
+                for a1_range, cell_format in formats:
+                    requests_body.append({
+                        'repeatCell': {
+                            'range': a1_range_to_grid_range(a1_range, sheet.id),
+                            'cell': {'userEnteredFormat': cell_format},
+                            'fields': f"userEnteredFormat({','.join(cell_format.keys())})"
+                        }
+                    })
+                
+                # One batch_update for the clear and all formatting, then one write for the values
+                spreadsheet.batch_update({'requests': requests_body})
+                sheet.update(data, value_input_option='USER_ENTERED')
                 
                 print(f"✅ Successfully uploaded to Google Sheets!")
                 print(f"🔗 View your sheet: https://docs.google.com/spreadsheets/d/{sheet.spreadsheet.id}")
@@ -677,48 +684,100 @@ class AppleMacScraperV6:
             print(f"❌ Failed to upload to Google Sheets: {e}")
             return False
 
+    def summarize_products(self, products: List[Dict]) -> tuple:
+        """Summary totals, specs coverage and best deal in a single pass over the products."""
+        specs_coverage = dict.fromkeys(SUMMARY_SPEC_FIELDS, 0)
+        priced_count = 0
+        total_value = 0
+        savings_count = 0
+        total_savings = 0
+        total_discount = 0
+        best_deal = None
+        best_deal_savings = None
+        
+        for p in products:
+            get = p.get  # bound once, reused for every field below
+            current_price = get('current_price')
+            if current_price:
+                priced_count += 1
+                total_value += current_price
+            
+            savings = get('savings')
+            if savings:
+                savings_count += 1
+                total_savings += savings
+                total_discount += get('discount_percentage', 0)
+                if best_deal is None or savings > best_deal_savings:
+                    best_deal, best_deal_savings = p, savings
+            
+            for spec in SUMMARY_SPEC_FIELDS:
+                if get(spec):
+                    specs_coverage[spec] += 1
+        
+        avg_discount = total_discount / savings_count if savings_count else 0
+        return priced_count, total_value, total_savings, avg_discount, specs_coverage, best_deal
+
+    def summarize_products_frame(self, products: List[Dict]) -> tuple:
+        """Same as summarize_products, as column operations for large catalogs."""
+        df = pd.DataFrame(products, columns=['current_price', 'savings', 'discount_percentage', *SUMMARY_SPEC_FIELDS])
+        prices = pd.to_numeric(df['current_price'], errors='coerce').fillna(0)
+        savings = pd.to_numeric(df['savings'], errors='coerce').fillna(0)
+        has_savings = savings != 0
+        
+        specs_coverage = {
+            spec: int(count)
+            for spec, count in df[list(SUMMARY_SPEC_FIELDS)].fillna('').astype(bool).sum().items()
+        }
+        
+        best_deal = None
+        avg_discount = 0.0
+        if has_savings.any():
+            best_deal = products[savings[has_savings].idxmax()]
+            avg_discount = float(pd.to_numeric(df.loc[has_savings, 'discount_percentage'], errors='coerce').fillna(0).mean())
+        
+        # Plain Python numbers, so print_summary formats them like the loop path's results
+        return int((prices != 0).sum()), float(prices.sum()), float(savings.sum()), avg_discount, specs_coverage, best_deal
+
     def print_summary(self, products: List[Dict]):
         """Print a comprehensive summary of scraped products."""
         if not products:
             print("\n❌ No products found")
             return
         
-        print(f"\n🎉 SCRAPING COMPLETE!")
-        print(f"=" * 60)
-        print(f"📊 Total products found: {len(products)}")
-        
-        # Calculate totals
-        products_with_prices = [p for p in products if p.get('current_price')]
-        total_value = sum(p.get('current_price', 0) for p in products_with_prices)
-        total_savings = sum(p.get('savings', 0) for p in products if p.get('savings'))
-        
-        products_with_savings = [p for p in products if p.get('savings')]
-        avg_discount = sum(p.get('discount_percentage', 0) for p in products_with_savings) / len(products_with_savings) if products_with_savings else 0
-        
-        print(f"💰 Products with pricing: {len(products_with_prices)}/{len(products)} ({len(products_with_prices)/len(products)*100:.1f}%)")
-        print(f"💰 Total catalog value: £{total_value:,.2f}")
-        print(f"💸 Total potential savings: £{total_savings:,.2f}")
-        print(f"📈 Average discount: {avg_discount:.1f}%")
+        # Calculate totals and specs coverage
+        if len(products) > SUMMARY_FRAME_THRESHOLD:
+            stats = self.summarize_products_frame(products)
+        else:
+            stats = self.summarize_products(products)
+        priced_count, total_value, total_savings, avg_discount, specs_coverage, best_deal = stats
+        product_count = len(products)
+        percent_per_product = 100 / product_count
+        
+        # Collect the report and write it in one go
+        lines = [
+            "\n🎉 SCRAPING COMPLETE!",
+            "=" * 60,
+            f"📊 Total products found: {product_count}",
+            f"💰 Products with pricing: {priced_count}/{product_count} ({priced_count * percent_per_product:.1f}%)",
+            f"💰 Total catalog value: £{total_value:,.2f}",
+            f"💸 Total potential savings: £{total_savings:,.2f}",
+            f"📈 Average discount: {avg_discount:.1f}%",
+        ]
         
         # Specs coverage
-        print(f"\n🔧 Specs coverage:")
-        specs_coverage = {
-            'memory': len([p for p in products if p.get('memory')]),
-            'storage': len([p for p in products if p.get('storage')]),
-            'chip': len([p for p in products if p.get('chip')]),
-            'color': len([p for p in products if p.get('color')])
-        }
-        
-        for spec, count in specs_coverage.items():
-            percentage = (count / len(products)) * 100
-            print(f"   {spec.title()}: {count}/{len(products)} ({percentage:.1f}%)")
+        lines.append("\n🔧 Specs coverage:")
+        lines.extend(
+            f"   {label}: {count}/{product_count} ({count * percent_per_product:.1f}%)"
+            for label, count in zip(SUMMARY_SPEC_LABELS, specs_coverage.values())
+        )
         
         # Best deals
-        if products_with_savings:
-            best_saving = max(products_with_savings, key=lambda x: x.get('savings', 0))
-            print(f"\n🏆 BEST DEAL:")
-            print(f"💰 {best_saving.get('name', 'Unknown')[:60]}...")
-            print(f"    £{best_saving.get('current_price', 0)} (save £{best_saving.get('savings', 0)})")
+        if best_deal is not None:
+            lines.append("\n🏆 BEST DEAL:")
+            lines.append(f"💰 {best_deal.get('name', 'Unknown')[:60]}...")
+            lines.append(f"    £{best_deal.get('current_price', 0)} (save £{best_deal.get('savings', 0)})")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():
@@ -746,13 +805,19 @@ def main():
     # Save results
     if products:
         print(f"\n💾 Saving data...")
-        csv_file = scraper.save_to_csv(products)
-        
-        # Upload to Google Sheets
-        if scraper.google_client:
-            scraper.upload_to_google_sheets(products)
-        else:
-            print("💡 Enable Google Sheets to automatically sync data")
+        rows = scraper.build_product_rows(products)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Upload to Google Sheets in the background so the CSV write overlaps it
+            sheets_future = None
+            if scraper.google_client:
+                sheets_future = executor.submit(scraper.upload_to_google_sheets, products, rows)
+            else:
+                print("💡 Enable Google Sheets to automatically sync data")
+            
+            csv_file = scraper.save_to_csv(products, rows=rows)
+            
+            if sheets_future:
+                sheets_future.result()
         
         print(f"\n✅ All done! Found {len(products)} products with FIXED pricing approach")
         if csv_file: